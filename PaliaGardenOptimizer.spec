@@ -13,6 +13,11 @@ a = Analysis(
         ('palia_config.json', '.'),
         ('palia_garden_optimizer.py', '.'),
         ('garden.py', '.'),
+        ('topology.py', '.'),
+        ('parallel.py', '.'),
+        ('genetic.py', '.'),
+        ('patterns.py', '.'),
+        ('patterns.json', '.'),
         ('crops.py', '.'),
         ('config.py', '.'),
         ('language.py', '.'),
@@ -22,6 +27,10 @@ a = Analysis(
     hiddenimports=[
         'palia_garden_optimizer',
         'garden',
+        'topology',
+        'parallel',
+        'genetic',
+        'patterns',
         'crops',
         'config',
         'language',
@@ -34,6 +43,8 @@ a = Analysis(
         'os',
         'sys',
         'argparse',
+        'multiprocessing',
+        'concurrent.futures',
     ],
     hookspath=[],
     hooksconfig={},
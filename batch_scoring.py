@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vectorized scoring of many garden layouts at once (requires numpy)
+"""
+
+import numpy as np
+
+from crops import CROPS, BONUS_WEIGHT, PREFERRED_WEIGHT, SAME_SPECIES_ADJ_PENALTY
+from garden import MODE_WEIGHTS
+
+# Crop codes used in layout arrays; 0 means an empty cell
+CROP_CODES = {name: i + 1 for i, name in enumerate(CROPS)}
+CROP_NAMES = {code: name for name, code in CROP_CODES.items()}
+
+# Effect codes (1-based, 0 = no effect) and a lookup table from crop code to effect code
+EFFECTS = list(BONUS_WEIGHT)
+EFFECT_OF_CROP = np.array(
+    [0] + [EFFECTS.index(CROPS[name]["effect"]) + 1 if CROPS[name]["effect"] else 0 for name in CROPS],
+    dtype=np.int8,
+)
+
+def encode_gardens(gardens):
+    """Stack gardens of the same size into (N, rows, cols) crop code and placement id arrays"""
+    gardens = list(gardens)
+    rows, cols = gardens[0].rows, gardens[0].cols
+    codes = np.zeros((len(gardens), rows, cols), dtype=np.int8)
+    pids = np.zeros((len(gardens), rows, cols), dtype=np.int32)
+    for i, garden in enumerate(gardens):
+        for pid, meta in garden.placements.items():
+            r, c, w, h = meta["r"], meta["c"], meta["w"], meta["h"]
+            codes[i, r:r + h, c:c + w] = CROP_CODES[meta["name"]]
+            pids[i, r:r + h, c:c + w] = pid
+    return codes, pids
+
+def score_layouts(codes, pids, preferred_name, optimization_mode="balanced"):
+    """Score a stack of layouts with the rules of score_garden_optimized.
+
+    codes holds crop codes (CROP_CODES, 0 = empty) and pids placement ids
+    (0 = empty), both shaped (N, rows, cols). Placement ids are needed
+    because cells of the same multi-cell plant never affect each other.
+    Returns (totals, metrics): totals is a float array of shape (N,) and
+    metrics holds per-layout arrays for "bonus_counts" (a dict per effect),
+    "same_species_adj" and "preferred_count". Counts match the reference
+    scorer exactly. Totals are rounded to 3 decimals and equal its
+    metrics["total_score"] exactly: every weight has at most 3 decimals, so
+    the true total is a multiple of 0.001 and rounding removes any
+    difference in float summation order.
+    """
+    codes = np.asarray(codes)
+    pids = np.asarray(pids)
+    if codes.ndim == 2:
+        codes = codes[None]
+        pids = pids[None]
+    n, rows, cols = codes.shape
+    weights = MODE_WEIGHTS.get(optimization_mode, MODE_WEIGHTS["balanced"])
+
+    padded_codes = np.pad(codes, ((0, 0), (1, 1), (1, 1)))
+    padded_pids = np.pad(pids, ((0, 0), (1, 1), (1, 1)))
+    occupied = codes > 0
+    got_effects = np.zeros((len(EFFECTS), n, rows, cols), dtype=bool)
+    same_species = np.zeros(n, dtype=np.int64)
+    for dr, dc in ((-1,0),(1,0),(0,-1),(0,1)):
+        n_codes = padded_codes[:, 1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+        n_pids = padded_pids[:, 1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+        other = occupied & (n_codes > 0) & (n_pids != pids)
+        same = other & (n_codes == codes)
+        same_species += same.sum(axis=(1, 2))
+        n_effects = np.where(other & ~same, EFFECT_OF_CROP[n_codes], 0)
+        for k in range(len(EFFECTS)):
+            got_effects[k] |= n_effects == k + 1
+    bonus = got_effects.sum(axis=(2, 3))
+
+    totals = -SAME_SPECIES_ADJ_PENALTY * same_species.astype(np.float64)
+    for k, eff in enumerate(EFFECTS):
+        totals += weights.get(eff, 0.0) * bonus[k]
+
+    if preferred_name in CROPS:
+        w, h = CROPS[preferred_name]["size"]
+        preferred_count = (codes == CROP_CODES[preferred_name]).sum(axis=(1, 2)) // (w * h)
+        effect = CROPS[preferred_name]["effect"]
+        multiplier = 2.0 if optimization_mode == "low_maintenance" and effect in ["water", "weed"] else 1.0
+        totals += PREFERRED_WEIGHT * multiplier * preferred_count
+    else:
+        preferred_count = np.zeros(n, dtype=np.int64)
+
+    totals = np.round(totals, 3)
+    metrics = {
+        "bonus_counts": {eff: bonus[k] for k, eff in enumerate(EFFECTS)},
+        "same_species_adj": same_species,
+        "preferred_count": preferred_count,
+        "optimization_mode": optimization_mode,
+    }
+    return totals, metrics
+
+def layout_metrics(totals, metrics, index):
+    """Metrics of one layout in the same format as score_garden_optimized"""
+    return {
+        "total_score": round(float(totals[index]), 3),
+        "bonus_counts": {eff: int(counts[index]) for eff, counts in metrics["bonus_counts"].items() if counts[index]},
+        "same_species_adj": int(metrics["same_species_adj"][index]),
+        "preferred_count": int(metrics["preferred_count"][index]),
+        "optimization_mode": metrics["optimization_mode"],
+    }
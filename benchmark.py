@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite for the Palia Garden Optimizer hot paths
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import subprocess
+import tracemalloc
+
+from crops import CROPS
+from garden import (create_garden, greedy_fill_optimized, local_search_optimized,
+                    score_garden_optimized, ScoreCache)
+
+try:
+    from batch_scoring import encode_gardens, score_layouts
+except ImportError:  # numpy is optional, only the score_layouts benchmark needs it
+    score_layouts = None
+
+GRID_SIZES = (3, 5, 9, 15, 20, 30, 50)
+QUICK_GRID_SIZES = (3, 9, 20)
+# Plants in the generated mixed inventory per grid cell (the rest stays free for moves)
+MIXED_DENSITY = 0.25
+SEED = 12345
+PREFERRED = "Apple"
+MODE = "balanced"
+# Candidate moves per local search run
+SEARCH_ITERATIONS = 2000
+# Random operations prepared for the can_place / move benchmarks
+OP_SAMPLES = 2000
+# Layouts scored together by the score_layouts benchmark, and random moves applied to each
+BATCH_LAYOUTS = 64
+BATCH_MOVES = 5
+
+def sample_inventory():
+    """Inventory of the bundled palia_config.json"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "palia_config.json")
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        return {name: cnt for name, cnt in json.load(f).get("inventory", {}).items() if cnt > 0}
+
+def mixed_inventory(rows, cols, rng):
+    """Mixed 1x1 / 2x2 / 3x3 inventory covering about MIXED_DENSITY plants per cell"""
+    names = sorted(CROPS)
+    inventory = {}
+    for _ in range(max(1, int(rows * cols * MIXED_DENSITY))):
+        name = rng.choice(names)
+        inventory[name] = inventory.get(name, 0) + 1
+    return inventory
+
+def measure(func, min_time):
+    """Call func until min_time seconds have passed, after one warm-up call; returns (calls, seconds)"""
+    func()
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls, elapsed
+
+def peak_memory(func):
+    """Peak traced allocation in KiB during one call of func"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024.0
+    finally:
+        tracemalloc.stop()
+
+def bench_case(rows, cols, inv_name, inventory, min_time):
+    """Benchmark every hot path on one grid / inventory; returns result dicts"""
+    rng = random.Random(SEED)
+    garden = create_garden(rows, cols)
+    greedy_fill_optimized(garden, inventory, PREFERRED, MODE, rng=random.Random(SEED))
+    names = sorted(CROPS)
+    pids = list(garden.placements)
+    place_ops = [(rng.choice(names), rng.randrange(rows), rng.randrange(cols)) for _ in range(OP_SAMPLES)]
+    move_ops = [(pid, rng.randrange(rows), rng.randrange(cols))
+                for pid in (rng.choice(pids) for _ in range(OP_SAMPLES))] if pids else []
+    empty = create_garden(rows, cols)
+    variants = []
+    for i in range(BATCH_LAYOUTS if score_layouts is not None and pids else 0):
+        variant = garden.clone()
+        for pid, r, c in move_ops[i * BATCH_MOVES:(i + 1) * BATCH_MOVES]:
+            variant.move(pid, r, c)
+        variants.append(variant)
+    batch = encode_gardens(variants) if variants else None
+
+    def run_can_place():
+        for name, r, c in place_ops:
+            garden.can_place(name, r, c)
+
+    def run_move():
+        work = garden.clone()
+        for pid, r, c in move_ops:
+            work.move(pid, r, c)
+
+    def run_search():
+        local_search_optimized(garden, PREFERRED, MODE, iterations=SEARCH_ITERATIONS, rng=random.Random(SEED))
+
+    def run_cached_search():
+        local_search_optimized(garden, PREFERRED, MODE, iterations=SEARCH_ITERATIONS, rng=random.Random(SEED),
+                               cache=ScoreCache())
+
+    def run_greedy():
+        work = empty.clone()
+        greedy_fill_optimized(work, inventory, PREFERRED, MODE, rng=random.Random(SEED))
+
+    # (name, callable, operations per call, unit)
+    benches = [
+        ("score_garden_optimized", lambda: score_garden_optimized(garden, PREFERRED, MODE, cache=None), 1, "ops"),
+        ("score_layouts", lambda: score_layouts(*batch, PREFERRED, MODE), len(variants), "ops"),
+        ("greedy_fill_optimized", run_greedy, 1, "ops"),
+        ("local_search_optimized", run_search, SEARCH_ITERATIONS, "evals"),
+        ("local_search_cached", run_cached_search, SEARCH_ITERATIONS, "evals"),
+        ("Garden.clone", garden.clone, 1, "ops"),
+        ("Garden.can_place", run_can_place, len(place_ops), "ops"),
+        ("Garden.move", run_move, len(move_ops), "ops"),
+    ]
+    results = []
+    for name, func, per_call, unit in benches:
+        if per_call == 0:
+            continue
+        calls, elapsed = measure(func, min_time)
+        results.append({
+            "benchmark": name,
+            "grid": f"{rows}x{cols}",
+            "inventory": inv_name,
+            "plants": len(pids),
+            "garden_class": type(garden).__name__,
+            f"{unit}_per_sec": round(calls * per_call / elapsed, 1),
+            "peak_kib": round(peak_memory(func), 1),
+        })
+    return results
+
+def run_suite(sizes, min_time, log=None):
+    """Run all cases; log(result) is called after every benchmark"""
+    results = []
+    sample = sample_inventory()
+    for size in sizes:
+        inventories = [("sample", sample), ("mixed", mixed_inventory(size, size, random.Random(SEED + size)))]
+        for inv_name, inventory in inventories:
+            for result in bench_case(size, size, inv_name, inventory, min_time):
+                results.append(result)
+                if log is not None:
+                    log(result)
+    return results
+
+def git_revision():
+    """Current commit hash, or None outside a git checkout"""
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+def result_key(result):
+    """Identity of a benchmark row across runs"""
+    return result["benchmark"], result["grid"], result["inventory"]
+
+def result_rate(result):
+    """The ops/sec or evals/sec value of a row"""
+    return result.get("ops_per_sec", result.get("evals_per_sec"))
+
+def format_result(result):
+    """One aligned text line for a result row"""
+    unit = "evals/s" if "evals_per_sec" in result else "ops/s"
+    return (f"{result['benchmark']:<24} {result['grid']:>6} {result['inventory']:<7} "
+            f"{result['plants']:>4} plants {result_rate(result):>12,.1f} {unit:<7} {result['peak_kib']:>9.1f} KiB")
+
+def compare(old_path, results):
+    """Print the speed ratio of every row against a previous JSON report"""
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = {result_key(r): r for r in json.load(f).get("results", [])}
+    print(f"\nCompared with {old_path} (new / old):")
+    for result in results:
+        before = old.get(result_key(result))
+        if before is None or not result_rate(before):
+            continue
+        ratio = result_rate(result) / result_rate(before)
+        print(f"{result['benchmark']:<24} {result['grid']:>6} {result['inventory']:<7} {ratio:>7.2f}x "
+              f"(memory {result['peak_kib'] - before['peak_kib']:+.1f} KiB)")
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark scoring, greedy fill, local search and Garden operations')
+    parser.add_argument('--quick', action='store_true', help=f'Only grids {", ".join(map(str, QUICK_GRID_SIZES))}')
+    parser.add_argument('--sizes', type=int, nargs='+', help='Square grid sizes to run (default: 3 to 50)')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Seconds to repeat each benchmark (default: 0.2)')
+    parser.add_argument('--out', help='Save the results as JSON to this file')
+    parser.add_argument('--compare', help='Previous JSON results to compare against')
+    args = parser.parse_args()
+
+    sizes = args.sizes or (QUICK_GRID_SIZES if args.quick else GRID_SIZES)
+    results = run_suite(sizes, args.min_time, log=lambda result: print(format_result(result)))
+    report = {
+        "meta": {
+            "commit": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": SEED,
+            "min_time": args.min_time,
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Saved {len(results)} results to {args.out}")
+    if args.compare:
+        compare(args.compare, results)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bitboard garden representation for Palia Garden Optimizer
+"""
+
+from crops import CROPS, BONUS_WEIGHT, PREFERRED_WEIGHT, SAME_SPECIES_ADJ_PENALTY
+from garden import MODE_WEIGHTS
+
+class BitboardGarden:
+    """Garden stored as Python big-int bitboards.
+
+    Cell (r, c) is bit r * stride + c, with one unused guard column
+    (stride = cols + 1) so horizontal shifts never wrap into the next row.
+    There is one board per crop and an occupancy board. Cells of the same
+    multi-cell plant must not affect each other, so two more boards mark
+    cells whose upper / left neighbor belongs to the same plant.
+    Boards are immutable ints, so clone() only copies a small dict.
+    """
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.stride = cols + 1
+        self.crops = {}        # crop name -> board
+        self.occupied = 0
+        self.internal_up = 0   # cells whose upper neighbor is the same plant
+        self.internal_left = 0 # cells whose left neighbor is the same plant
+
+    @classmethod
+    def from_garden(cls, garden):
+        """Build bitboards from a Garden (or anything with rows, cols and placements)"""
+        board = cls(garden.rows, garden.cols)
+        for meta in garden.placements.values():
+            board.place(meta["name"], meta["r"], meta["c"])
+        return board
+
+    def _rect(self, top_r, top_c, w, h):
+        """Board with a w x h rectangle set"""
+        row = ((1 << w) - 1) << top_c
+        mask = 0
+        for r in range(top_r, top_r + h):
+            mask |= row << (r * self.stride)
+        return mask
+
+    def can_place(self, name, top_r, top_c):
+        """Check if a plant can be placed at given position"""
+        w, h = CROPS[name]["size"]
+        if top_r < 0 or top_c < 0 or top_r + h > self.rows or top_c + w > self.cols:
+            return False
+        return not (self.occupied & self._rect(top_r, top_c, w, h))
+
+    def place(self, name, top_r, top_c):
+        """Place a plant at given position; returns False if it does not fit"""
+        if not self.can_place(name, top_r, top_c):
+            return False
+        w, h = CROPS[name]["size"]
+        mask = self._rect(top_r, top_c, w, h)
+        self.crops[name] = self.crops.get(name, 0) | mask
+        self.occupied |= mask
+        if h > 1:
+            self.internal_up |= self._rect(top_r + 1, top_c, w, h - 1)
+        if w > 1:
+            self.internal_left |= self._rect(top_r, top_c + 1, w - 1, h)
+        return True
+
+    def clone(self):
+        """Create a copy of the garden (boards are immutable ints)"""
+        board = BitboardGarden(self.rows, self.cols)
+        board.crops = dict(self.crops)
+        board.occupied = self.occupied
+        board.internal_up = self.internal_up
+        board.internal_left = self.internal_left
+        return board
+
+    def score(self, preferred_name, optimization_mode="balanced"):
+        """Score with the rules and metrics format of score_garden_optimized"""
+        stride = self.stride
+        weights = MODE_WEIGHTS.get(optimization_mode, MODE_WEIGHTS["balanced"])
+        # different-plant neighbor boards for up, down, left, right
+        foreign = (
+            ~self.internal_up,
+            ~(self.internal_up >> stride),
+            ~self.internal_left,
+            ~(self.internal_left >> 1),
+        )
+        effect_boards = {}
+        for name, board in self.crops.items():
+            eff = CROPS[name]["effect"]
+            if eff:
+                effect_boards[eff] = effect_boards.get(eff, 0) | board
+
+        bonus_counts = {}
+        same_species_adjs = 0
+        pref_count = 0
+        total = 0.0
+        for name, board in self.crops.items():
+            # neighbors of other plants of the same crop
+            same_species_adjs += (
+                (board & (board << stride) & foreign[0]).bit_count()
+                + (board & (board >> stride) & foreign[1]).bit_count()
+                + (board & (board << 1) & foreign[2]).bit_count()
+                + (board & (board >> 1) & foreign[3]).bit_count()
+            )
+            # effects from neighbors of a different crop (never the same plant)
+            for eff, eff_board in effect_boards.items():
+                source = eff_board & ~board
+                if not source:
+                    continue
+                got = board & ((source << stride) | (source >> stride) | (source << 1) | (source >> 1))
+                count = got.bit_count()
+                if count:
+                    bonus_counts[eff] = bonus_counts.get(eff, 0) + count
+            if name == preferred_name:
+                w, h = CROPS[name]["size"]
+                pref_count = board.bit_count() // (w * h)
+
+        for eff in BONUS_WEIGHT:
+            if eff in bonus_counts:
+                total += weights.get(eff, 0.0) * bonus_counts[eff]
+        total -= SAME_SPECIES_ADJ_PENALTY * same_species_adjs
+        if pref_count:
+            multiplier = 2.0 if optimization_mode == "low_maintenance" and CROPS[preferred_name]["effect"] in ["water", "weed"] else 1.0
+            total += PREFERRED_WEIGHT * multiplier * pref_count
+
+        metrics = {
+            "total_score": round(total, 3),
+            "bonus_counts": bonus_counts,
+            "same_species_adj": same_species_adjs,
+            "preferred_count": pref_count,
+            "optimization_mode": optimization_mode
+        }
+        return total, metrics
@@ -4,9 +4,66 @@
 Garden logic and optimization algorithms for Palia Garden Optimizer
 """
 
+import math
 import random
-from collections import Counter
+import itertools
+import time
+import hashlib
+import bisect
+import threading
+from collections import Counter, OrderedDict
+from functools import lru_cache
 from crops import CROPS, BONUS_WEIGHT, PREFERRED_WEIGHT, SAME_SPECIES_ADJ_PENALTY
+from topology import get_topology
+
+# Weight multipliers per optimization mode
+MODE_WEIGHTS = {
+    "balanced": {"harvest": 1.0, "quality": 0.8, "growth": 0.8, "water": 0.6, "weed": 0.3},
+    "low_maintenance": {"harvest": 0.5, "quality": 0.3, "growth": 0.3, "water": 2.0, "weed": 2.0},
+    "max_harvest": {"harvest": 2.0, "quality": 0.5, "growth": 1.0, "water": 0.3, "weed": 0.3},
+    "max_quality": {"harvest": 0.8, "quality": 2.0, "growth": 1.0, "water": 0.5, "weed": 0.3}
+}
+
+# Tolerance for comparing accumulated score deltas
+SCORE_EPS = 1e-9
+
+# Search engines call their progress callback every this many iterations
+PROGRESS_INTERVAL = 250
+
+# Layouts kept by the shared score cache (a few MB; it is cleared at the start of every optimize run)
+SCORE_CACHE_SIZE = 20000
+
+# Largest plot (in cells) solve_exact accepts, and partial states it memoizes
+EXACT_MAX_CELLS = 36
+EXACT_MEMO_LIMIT = 100000
+# The memo is dropped when this many stored states have not produced a single hit
+EXACT_MEMO_PROBE = 20000
+# Engine name of solve_exact in the UI and on the command line
+EXACT_ENGINE = "exact"
+
+def _hash64(text):
+    """Stable 64-bit hash of a string (the same in every process and run)"""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+_zobrist_keys = {}  # (crop name, r, c) -> random 64-bit key
+
+def zobrist_key(name, top_r, top_c):
+    """Zobrist key of a crop anchored at (top_r, top_c)"""
+    key = _zobrist_keys.get((name, top_r, top_c))
+    if key is None:
+        key = _zobrist_keys[(name, top_r, top_c)] = _hash64(f"{name}|{top_r}|{top_c}")
+    return key
+
+@lru_cache(maxsize=256)
+def _orbit_keys(rows, cols, name):
+    """Zobrist keys of a plant under each of the grid's symmetries (identity first), indexed [top_r][top_c]"""
+    topo = get_topology(rows, cols)
+    w, h = CROPS[name]["size"]
+    maps = [topo.anchor_map(symmetry, w, h) for symmetry in topo.symmetries]
+    return [
+        [tuple(zobrist_key(name, *table[r][c]) for table in maps) for c in range(cols - w + 1)]
+        for r in range(rows - h + 1)
+    ]
 
 def ortho_neighbors(r, c, rows, cols):
     """Get orthogonal neighbors of a cell"""
@@ -24,12 +81,38 @@ class Garden:
         self.grid = [[None for _ in range(cols)] for _ in range(rows)]  # placement ids
         self.placements = {}  # pid -> {name,r,c,w,h}
         self.next_id = 1
+        self._journal = None  # undo records since checkpoint(), None when not recording
+        self._free_index = None  # FreeSpaceIndex, built by the first first_fit() call
+        # XOR of zobrist_key(name, r, c) over all plants; equal layouts hash equal whatever their pids
+        self.zobrist = 0
+        # Zobrist hash under each of the grid's symmetries (identity first), kept up to date
+        # once track_symmetries() has been called; None until then
+        self.orbit = None
+
+    def track_symmetries(self):
+        """Start keeping self.orbit up to date through every change to the garden"""
+        if self.orbit is not None:
+            return
+        self.orbit = [0] * len(get_topology(self.rows, self.cols).symmetries)
+        for meta in self.placements.values():
+            self._toggle_orbit(meta["name"], meta["r"], meta["c"])
+
+    def _toggle_orbit(self, name, top_r, top_c):
+        """XOR a plant's key under every symmetry into self.orbit"""
+        keys = _orbit_keys(self.rows, self.cols, name)[top_r][top_c]
+        self.orbit = [value ^ key for value, key in zip(self.orbit, keys)]
 
     def clear(self):
         """Clear all plants from the garden"""
+        if self._journal is not None:
+            self._journal.append(("clear", dict(self.placements), self.next_id))
         self.grid = [[None for _ in range(self.cols)] for _ in range(self.rows)]
         self.placements.clear()
         self.next_id = 1
+        self._free_index = None
+        self.zobrist = 0
+        if self.orbit is not None:
+            self.orbit = [0] * len(self.orbit)
 
     def can_place(self, name, top_r, top_c):
         """Check if a plant can be placed at given position"""
@@ -52,6 +135,13 @@ class Garden:
         for r in range(top_r, top_r + h):
             for c in range(top_c, top_c + w):
                 self.grid[r][c] = pid
+        self.zobrist ^= zobrist_key(name, top_r, top_c)
+        if self.orbit is not None:
+            self._toggle_orbit(name, top_r, top_c)
+        if self._free_index is not None:
+            self._free_index.update(top_r, top_c, w, h, 1)
+        if self._journal is not None:
+            self._journal.append(("place", pid))
         return pid
 
     def remove(self, pid):
@@ -62,63 +152,340 @@ class Garden:
         for r in range(meta["r"], meta["r"] + meta["h"]):
             for c in range(meta["c"], meta["c"] + meta["w"]):
                 self.grid[r][c] = None
+        self.zobrist ^= zobrist_key(meta["name"], meta["r"], meta["c"])
+        if self.orbit is not None:
+            self._toggle_orbit(meta["name"], meta["r"], meta["c"])
+        if self._free_index is not None:
+            self._free_index.update(meta["r"], meta["c"], meta["w"], meta["h"], -1)
+        if self._journal is not None:
+            self._journal.append(("remove", pid, meta))
 
-    def move(self, pid, new_r, new_c):
-        """Move a plant to a new position"""
+    def _restore(self, pid, meta):
+        """Put a removed placement back under its original id"""
+        self.placements[pid] = meta
+        for r in range(meta["r"], meta["r"] + meta["h"]):
+            for c in range(meta["c"], meta["c"] + meta["w"]):
+                self.grid[r][c] = pid
+        self.zobrist ^= zobrist_key(meta["name"], meta["r"], meta["c"])
+        if self.orbit is not None:
+            self._toggle_orbit(meta["name"], meta["r"], meta["c"])
+        if self._free_index is not None:
+            self._free_index.update(meta["r"], meta["c"], meta["w"], meta["h"], 1)
+
+    def can_move(self, pid, new_r, new_c):
+        """Check if a plant can be moved to a new position"""
         if pid not in self.placements:
             return False
         meta = self.placements[pid]
         w, h = meta["w"], meta["h"]
-        # remove
-        for r in range(meta["r"], meta["r"] + h):
-            for c in range(meta["c"], meta["c"] + w):
-                self.grid[r][c] = None
-        ok = True
         if new_r < 0 or new_c < 0 or new_r + h > self.rows or new_c + w > self.cols:
-            ok = False
-        else:
-            for r in range(new_r, new_r + h):
-                for c in range(new_c, new_c + w):
-                    if self.grid[r][c] is not None:
-                        ok = False; break
-                if not ok: break
-        if not ok:
-            # restore
-            for r in range(meta["r"], meta["r"] + h):
-                for c in range(meta["c"], meta["c"] + w):
-                    self.grid[r][c] = pid
             return False
-        meta["r"], meta["c"] = new_r, new_c
         for r in range(new_r, new_r + h):
             for c in range(new_c, new_c + w):
-                self.grid[r][c] = pid
+                n_pid = self.grid[r][c]
+                if n_pid is not None and n_pid != pid:
+                    return False
         return True
 
+    def move(self, pid, new_r, new_c):
+        """Move a plant to a new position"""
+        if not self.can_move(pid, new_r, new_c):
+            return False
+        self._relocate(pid, new_r, new_c)
+        return True
+
+    def _relocate(self, pid, new_r, new_c):
+        """move() without the can_move() check, for callers that already made it"""
+        meta = self.placements[pid]
+        old_r, old_c, w, h = meta["r"], meta["c"], meta["w"], meta["h"]
+        if self._journal is not None:
+            self._journal.append(("move", pid, old_r, old_c))
+        if self._free_index is not None:
+            self._free_index.update(old_r, old_c, w, h, -1)
+            self._free_index.update(new_r, new_c, w, h, 1)
+        grid = self.grid
+        for r in range(old_r, old_r + h):
+            grid[r][old_c:old_c + w] = [None] * w
+        name = meta["name"]
+        self.zobrist ^= _zobrist_keys[(name, old_r, old_c)] ^ (
+            _zobrist_keys.get((name, new_r, new_c)) or zobrist_key(name, new_r, new_c))
+        if self.orbit is not None:
+            keys = _orbit_keys(self.rows, self.cols, name)
+            self.orbit = [value ^ a ^ b for value, a, b in zip(self.orbit, keys[old_r][old_c], keys[new_r][new_c])]
+        meta["r"], meta["c"] = new_r, new_c
+        for r in range(new_r, new_r + h):
+            grid[r][new_c:new_c + w] = [pid] * w
+
+    def checkpoint(self):
+        """Start recording changes so they can be undone with rollback()"""
+        if self._journal is None:
+            self._journal = []
+        else:
+            self._journal.clear()
+
+    def rollback(self):
+        """Undo every change since the last checkpoint(); recording continues from there"""
+        journal = self._journal
+        if not journal:
+            return
+        self._journal = None
+        for entry in reversed(journal):
+            op = entry[0]
+            if op == "move":
+                _, pid, r, c = entry
+                self._relocate(pid, r, c)
+            elif op == "place":
+                _, pid = entry
+                self.remove(pid)
+                self.next_id = pid
+            elif op == "remove":
+                _, pid, meta = entry
+                self._restore(pid, meta)
+            elif op == "clear":
+                _, placements, next_id = entry
+                for pid, meta in placements.items():
+                    self._restore(pid, meta)
+                self.next_id = next_id
+        journal.clear()
+        self._journal = journal
+
+    def commit(self):
+        """Keep every change since the last checkpoint() and stop recording"""
+        self._journal = None
+
+    def first_fit(self, name):
+        """Find the first free position (row-major) for a plant, or None.
+
+        Uses a FreeSpaceIndex that is built on the first call and then kept
+        up to date by every change to the garden.
+        """
+        if self._free_index is None:
+            self._free_index = FreeSpaceIndex(self)
+        w, h = CROPS[name]["size"]
+        return self._free_index.first_fit(w, h)
+
+    def to_layout(self):
+        """Compact, JSON-friendly description of the plants: {rows, cols, plants: [[name, r, c], ...]}"""
+        return {
+            "rows": self.rows,
+            "cols": self.cols,
+            "plants": [[meta["name"], meta["r"], meta["c"]] for meta in self.placements.values()],
+        }
+
+    def load_layout(self, layout):
+        """Replace the plants with those of a layout from to_layout(); returns how many were placed"""
+        self.clear()
+        placed = 0
+        for name, r, c in layout["plants"]:
+            if self.place(name, r, c) is not None:
+                placed += 1
+        return placed
+
     def clone(self):
         """Create a deep copy of the garden"""
-        g = Garden(self.rows, self.cols)
+        g = self.__class__(self.rows, self.cols)
         g.grid = [row[:] for row in self.grid]
         g.placements = {pid: dict(meta) for pid, meta in self.placements.items()}
         g.next_id = self.next_id
+        g.zobrist = self.zobrist
+        if self.orbit is not None:
+            g.orbit = self.orbit
         return g
 
-def score_garden_optimized(garden, preferred_name, optimization_mode="balanced"):
-    """Enhanced scoring system with different optimization modes"""
+class FreeSpaceIndex:
+    """Feasible-anchor index for first-fit placement.
+
+    For every footprint size it keeps, per anchor (row-major), the number of
+    placements overlapping that footprint, plus a cursor before which no
+    anchor is free. Each placement updates only the anchors overlapping it, and
+    first-fit advances the cursor, so greedy filling stays near-constant time
+    per plant instead of rescanning the grid.
+    """
+
+    def __init__(self, garden):
+        self.garden = garden
+        self.rows = garden.rows
+        self.cols = garden.cols
+        self._blocked = {}  # (w, h) -> overlapping placements per anchor
+        self._cursor = {}   # (w, h) -> flat index of the first possibly free anchor
+        for w, h in sorted({meta["size"] for meta in CROPS.values()}):
+            self._build(w, h)
+
+    def _build(self, w, h):
+        """Create the anchor counts for a (w, h) footprint from the current placements"""
+        self._blocked[(w, h)] = [0] * (max(0, self.rows - h + 1) * max(0, self.cols - w + 1))
+        self._cursor[(w, h)] = 0
+        for meta in self.garden.placements.values():
+            self._update_size(w, h, meta["r"], meta["c"], meta["w"], meta["h"], 1)
+        return self._blocked[(w, h)]
+
+    def _update_size(self, sw, sh, top_r, top_c, w, h, step):
+        """Adjust the counts of every (sw, sh) anchor overlapping a footprint"""
+        blocked = self._blocked[(sw, sh)]
+        anchor_cols = self.cols - sw + 1
+        r0, r1 = max(0, top_r - sh + 1), min(self.rows - sh, top_r + h - 1)
+        c0, c1 = max(0, top_c - sw + 1), min(self.cols - sw, top_c + w - 1)
+        if r0 > r1 or c0 > c1:
+            return
+        for r in range(r0, r1 + 1):
+            base = r * anchor_cols
+            for i in range(base + c0, base + c1 + 1):
+                blocked[i] += step
+        if step < 0:
+            first = r0 * anchor_cols + c0
+            if first < self._cursor[(sw, sh)]:
+                self._cursor[(sw, sh)] = first
+
+    def update(self, top_r, top_c, w, h, step):
+        """Apply a footprint becoming occupied (step=1) or free (step=-1)"""
+        for sw, sh in self._blocked:
+            self._update_size(sw, sh, top_r, top_c, w, h, step)
+
+    def first_fit(self, w, h):
+        """First free anchor (row-major) for a (w, h) footprint, or None"""
+        blocked = self._blocked.get((w, h))
+        if blocked is None:
+            blocked = self._build(w, h)
+        i, n = self._cursor[(w, h)], len(blocked)
+        while i < n and blocked[i]:
+            i += 1
+        self._cursor[(w, h)] = i
+        if i == n:
+            return None
+        return divmod(i, self.cols - w + 1)
+
+def create_garden(rows, cols):
+    """Create a garden for the grid size"""
+    return Garden(rows, cols)
+
+def garden_from_layout(layout):
+    """Build a garden from a layout produced by Garden.to_layout()"""
+    garden = create_garden(layout["rows"], layout["cols"])
+    garden.load_layout(layout)
+    return garden
+
+def _orbit_after_move(garden, pid, new_r, new_c):
+    """Garden.orbit of the layout after moving a plant to (new_r, new_c), without moving it"""
+    garden.track_symmetries()
+    meta = garden.placements[pid]
+    keys = _orbit_keys(garden.rows, garden.cols, meta["name"])
+    return [value ^ a ^ b for value, a, b in zip(garden.orbit, keys[meta["r"]][meta["c"]], keys[new_r][new_c])]
+
+def canonical_key(garden):
+    """Hash shared by a layout and all its reflections (and rotations on square grids).
+
+    It is the smallest of the Zobrist hashes in Garden.orbit, which the
+    garden keeps up to date from the first call on. Scoring is invariant
+    under these transforms, so ScoreCache keys are built from it.
+    """
+    garden.track_symmetries()
+    return min(garden.orbit)
+
+@lru_cache(maxsize=64)
+def _score_context(rows, cols, preferred_name, optimization_mode):
+    """Key mixed into layout hashes so scores of other grids, preferred plants or modes never collide"""
+    return _hash64(f"{rows}x{cols}|{preferred_name}|{optimization_mode}")
+
+class ScoreCache:
+    """Bounded LRU cache of layout scores keyed by Zobrist hash.
+
+    Keys are the canonical_key of the layout mixed with the grid size,
+    preferred plant and mode, so a layout reached again by any sequence of
+    moves, or a mirrored / rotated copy of it, is found without rescoring;
+    the engines key candidate moves the same way with _move_key. Entries are (total, metrics); the search engines store
+    totals only (metrics None), which score_garden_optimized treats as a
+    miss. hits and misses count lookups. One cache may be used
+    from the UI thread and a search thread at the same time; a lock guards
+    every access.
+    """
+
+    def __init__(self, maxsize=SCORE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, garden, preferred_name, optimization_mode):
+        """Cache key of a garden's current layout"""
+        return canonical_key(garden) ^ _score_context(garden.rows, garden.cols, preferred_name, optimization_mode)
+
+    def get(self, key, need_metrics=False):
+        """(total, metrics) for a key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (need_metrics and entry[1] is None):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, total, metrics=None):
+        """Store a score, evicting the least recently used entries beyond maxsize"""
+        with self._lock:
+            self._entries[key] = (total, metrics)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        """Share of lookups that were hits"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def info(self):
+        """Counters as a plain dict for JSON output"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+# Score cache shared by score_garden_optimized and the search engines
+SCORE_CACHE = ScoreCache()
+
+def _copy_metrics(metrics):
+    """Copy of a metrics dict, so cached metrics cannot be changed by callers"""
+    metrics = dict(metrics)
+    metrics["bonus_counts"] = dict(metrics["bonus_counts"])
+    return metrics
+
+def score_garden_optimized(garden, preferred_name, optimization_mode="balanced", cache=SCORE_CACHE):
+    """Enhanced scoring system with different optimization modes.
+
+    Results are looked up in and stored to cache (a ScoreCache, the shared
+    SCORE_CACHE by default); pass cache=None to always score from scratch.
+    """
+    if not hasattr(garden, "grid"):
+        # compact representations (e.g. bitboard.BitboardGarden) score themselves
+        return garden.score(preferred_name, optimization_mode)
+    if cache is not None:
+        key = cache.key(garden, preferred_name, optimization_mode)
+        entry = cache.get(key, need_metrics=True)
+        if entry is not None:
+            return entry[0], _copy_metrics(entry[1])
     total = 0.0
     bonus_counts = Counter()
     same_species_adjs = 0
     pref_count = 0
-    rows, cols = garden.rows, garden.cols
-    
-    # Define weight multipliers based on optimization mode
-    mode_weights = {
-        "balanced": {"harvest": 1.0, "quality": 0.8, "growth": 0.8, "water": 0.6, "weed": 0.3},
-        "low_maintenance": {"harvest": 0.5, "quality": 0.3, "growth": 0.3, "water": 2.0, "weed": 2.0},
-        "max_harvest": {"harvest": 2.0, "quality": 0.5, "growth": 1.0, "water": 0.3, "weed": 0.3},
-        "max_quality": {"harvest": 0.8, "quality": 2.0, "growth": 1.0, "water": 0.5, "weed": 0.3}
-    }
+    grid = garden.grid
+    neighbors = get_topology(garden.rows, garden.cols).cell_neighbors
     
-    weights = mode_weights.get(optimization_mode, mode_weights["balanced"])
+    weights = MODE_WEIGHTS.get(optimization_mode, MODE_WEIGHTS["balanced"])
     
     for pid, meta in garden.placements.items():
         name = meta["name"]
@@ -128,10 +495,11 @@ def score_garden_optimized(garden, preferred_name, optimization_mode="balanced")
             total += PREFERRED_WEIGHT * multiplier
             pref_count += 1
         for r in range(meta["r"], meta["r"] + meta["h"]):
+            row_neighbors = neighbors[r]
             for c in range(meta["c"], meta["c"] + meta["w"]):
                 got_effects = set()
-                for nr, nc in ortho_neighbors(r, c, rows, cols):
-                    n_pid = garden.grid[nr][nc]
+                for nr, nc in row_neighbors[c]:
+                    n_pid = grid[nr][nc]
                     if n_pid is None or n_pid == pid:
                         continue
                     n_name = garden.placements[n_pid]["name"]
@@ -153,16 +521,396 @@ def score_garden_optimized(garden, preferred_name, optimization_mode="balanced")
         "preferred_count": pref_count,
         "optimization_mode": optimization_mode
     }
+    if cache is not None:
+        cache.put(key, total, _copy_metrics(metrics))
     return total, metrics
 
-def greedy_fill_optimized(garden, inventory, preferred_name, optimization_mode="balanced"):
-    """Enhanced greedy fill with optimization mode priority"""
+# Effect of every crop, for the per-neighbor loops of delta scoring
+_EFFECTS = {name: meta["effect"] for name, meta in CROPS.items()}
+
+def _cells_score(garden, cells, weights, topo):
+    """Score contributed by some cells (same rules as score_garden_optimized)"""
+    grid = garden.grid
+    placements = garden.placements
+    neighbors = topo.cell_neighbors
+    score = 0.0
+    for r, c in cells:
+        pid = grid[r][c]
+        if pid is None:
+            continue
+        name = placements[pid]["name"]
+        got_effects = None
+        for nr, nc in neighbors[r][c]:
+            n_pid = grid[nr][nc]
+            if n_pid is None or n_pid == pid:
+                continue
+            n_name = placements[n_pid]["name"]
+            if n_name == name:
+                score -= SAME_SPECIES_ADJ_PENALTY
+                continue
+            eff = _EFFECTS[n_name]
+            if eff:
+                if got_effects is None:
+                    got_effects = {eff}
+                else:
+                    got_effects.add(eff)
+        if got_effects:
+            for eff in got_effects:
+                score += weights.get(eff, 0.0)
+    return score
+
+def _move_cells(topo, meta, new_r, new_c):
+    """Cells whose score can change when a plant moves: its old and new region, each cell once"""
+    r, c, w, h = meta["r"], meta["c"], meta["w"], meta["h"]
+    region = topo.region(w, h)
+    if new_r - r > h + 1 or r - new_r > h + 1 or new_c - c > w + 1 or c - new_c > w + 1:
+        # regions reach one cell beyond the footprints, so these two cannot overlap
+        return region[r][c] + region[new_r][new_c]
+    cells = set(region[r][c])
+    cells.update(region[new_r][new_c])
+    return cells
+
+def _move_key(garden, pid, new_r, new_c, context):
+    """ScoreCache key of the layout after moving a plant (context from _score_context)"""
+    return context ^ min(_orbit_after_move(garden, pid, new_r, new_c))
+
+class _MoveScorer:
+    """Per-cell scores and effect counts of a garden, for pricing relocation moves without making them.
+
+    For every occupied cell it keeps the cell's score and how many neighbor
+    cells give it each effect (same rules as score_garden_optimized). A move
+    whose old and new regions (GridTopology.region) do not overlap changes
+    only the plant's own cells and one neighbor of each perimeter cell, so
+    it is priced from these tables alone; nearer moves are made in place
+    between Garden.checkpoint() and rollback(). Only apply() changes the
+    garden, so rejected candidates cost no moves. Plants must not be placed
+    or removed while a scorer is in use.
+    """
+
+    def __init__(self, garden, weights, topo):
+        self.garden = garden
+        self.weights = weights
+        self.topo = topo
+        self.names = {pid: meta["name"] for pid, meta in garden.placements.items()}
+        self.scores = [[0.0] * garden.cols for _ in range(garden.rows)]
+        self.counts = [[None] * garden.cols for _ in range(garden.rows)]  # effect -> neighbor cells giving it
+        for r in range(garden.rows):
+            for c in range(garden.cols):
+                self._refresh(r, c)
+
+    def _refresh(self, r, c):
+        """Recompute the score and effect counts of one cell from the grid"""
+        grid = self.garden.grid
+        pid = grid[r][c]
+        if pid is None:
+            self.scores[r][c] = 0.0
+            self.counts[r][c] = None
+            return
+        names = self.names
+        name = names[pid]
+        score = 0.0
+        counts = {}
+        for nr, nc in self.topo.cell_neighbors[r][c]:
+            n_pid = grid[nr][nc]
+            if n_pid is None or n_pid == pid:
+                continue
+            n_name = names[n_pid]
+            if n_name == name:
+                score -= SAME_SPECIES_ADJ_PENALTY
+                continue
+            eff = _EFFECTS[n_name]
+            if eff:
+                counts[eff] = counts.get(eff, 0) + 1
+        for eff in counts:
+            score += self.weights.get(eff, 0.0)
+        self.scores[r][c] = score
+        self.counts[r][c] = counts
+
+    def delta(self, pid, new_r, new_c):
+        """Score change of moving a plant, or None if it cannot move there; the garden is left unchanged"""
+        garden = self.garden
+        if not garden.can_move(pid, new_r, new_c):
+            return None
+        meta = garden.placements[pid]
+        r, c, w, h = meta["r"], meta["c"], meta["w"], meta["h"]
+        scores = self.scores
+        if new_r - r <= h + 1 and r - new_r <= h + 1 and new_c - c <= w + 1 and c - new_c <= w + 1:
+            # the regions may overlap: score them in place
+            cells = _move_cells(self.topo, meta, new_r, new_c)
+            before = 0.0
+            for x, y in cells:
+                before += scores[x][y]
+            garden.checkpoint()
+            garden._relocate(pid, new_r, new_c)
+            after = _cells_score(garden, cells, self.weights, self.topo)
+            garden.rollback()
+            garden.commit()
+            return after - before
+        grid = garden.grid
+        names = self.names
+        counts = self.counts
+        weights = self.weights
+        name = meta["name"]
+        effect = _EFFECTS[name]
+        weight = weights.get(effect, 0.0) if effect else 0.0
+        perimeter = self.topo.perimeter(w, h)
+        delta = 0.0
+        for x in range(r, r + h):
+            for y in range(c, c + w):
+                delta -= scores[x][y]
+        # every perimeter cell touches exactly one footprint cell
+        for x, y in perimeter[r][c]:
+            q = grid[x][y]
+            if q is None:
+                continue
+            if names[q] == name:
+                delta += SAME_SPECIES_ADJ_PENALTY
+            elif effect and counts[x][y].get(effect) == 1:
+                delta -= weight
+        for x, y in perimeter[new_r][new_c]:
+            q = grid[x][y]
+            if q is None:
+                continue
+            if names[q] == name:
+                delta -= SAME_SPECIES_ADJ_PENALTY
+            elif effect and not counts[x][y].get(effect):
+                delta += weight
+        # the plant's new cells; their neighbors inside the new footprint are still empty
+        neighbors = self.topo.cell_neighbors
+        for x in range(new_r, new_r + h):
+            for y in range(new_c, new_c + w):
+                got_effects = None
+                for nx, ny in neighbors[x][y]:
+                    q = grid[nx][ny]
+                    if q is None:
+                        continue
+                    n_name = names[q]
+                    if n_name == name:
+                        delta -= SAME_SPECIES_ADJ_PENALTY
+                        continue
+                    eff = _EFFECTS[n_name]
+                    if eff:
+                        if got_effects is None:
+                            got_effects = {eff}
+                        else:
+                            got_effects.add(eff)
+                if got_effects:
+                    for eff in got_effects:
+                        delta += weights.get(eff, 0.0)
+        return delta
+
+    def apply(self, pid, new_r, new_c):
+        """Make a move that delta() found possible and update the tables around it"""
+        cells = _move_cells(self.topo, self.garden.placements[pid], new_r, new_c)
+        self.garden._relocate(pid, new_r, new_c)
+        for r, c in cells:
+            self._refresh(r, c)
+
+def _move_delta(scorer, pid, new_r, new_c, stats=None, cache=None, context=0, score=0.0):
+    """Score change of moving a plant, or None if the move is not possible; the garden is left unchanged.
+
+    With a SearchStats, the candidate is counted and its time recorded (see _timed_move_delta).
+    With a ScoreCache, score must be the garden's current total: a layout
+    already in the cache is not rescored, and new totals are stored.
+    """
+    if stats is not None:
+        return _timed_move_delta(scorer, pid, new_r, new_c, stats, cache, context, score)
+    if cache is None:
+        return scorer.delta(pid, new_r, new_c)
+    if not scorer.garden.can_move(pid, new_r, new_c):
+        return None
+    key = _move_key(scorer.garden, pid, new_r, new_c, context)
+    entry = cache.get(key)
+    if entry is not None:
+        return entry[0] - score
+    delta = scorer.delta(pid, new_r, new_c)
+    cache.put(key, score + delta)
+    return delta
+
+def _timed_move_delta(scorer, pid, new_r, new_c, stats, cache=None, context=0, score=0.0):
+    """_move_delta that also fills in a SearchStats.
+
+    Infeasible candidates count as moving time, feasible ones as scoring time.
+    """
+    stats.tried += 1
+    t0 = time.perf_counter()
+    delta = _move_delta(scorer, pid, new_r, new_c, None, cache, context, score)
+    elapsed = time.perf_counter() - t0
+    if delta is None:
+        stats.infeasible += 1
+        stats.move_time += elapsed
+    else:
+        stats.score_time += elapsed
+    return delta
+
+def _apply_move(scorer, pid, new_r, new_c, stats=None):
+    """scorer.apply() a priced move, adding the time to stats.move_time when instrumented"""
+    if stats is None:
+        scorer.apply(pid, new_r, new_c)
+        return
+    t0 = time.perf_counter()
+    scorer.apply(pid, new_r, new_c)
+    stats.move_time += time.perf_counter() - t0
+
+def _timed_clone(garden, stats):
+    """Clone a garden, adding the time to stats.clone_time when instrumented"""
+    if stats is None:
+        return garden.clone()
+    t0 = time.perf_counter()
+    copy = garden.clone()
+    stats.clone_time += time.perf_counter() - t0
+    return copy
+
+def _timed_score(garden, preferred_name, optimization_mode, stats, cache=None):
+    """score_garden_optimized total, adding the time to stats.score_time when instrumented"""
+    if stats is None:
+        return score_garden_optimized(garden, preferred_name, optimization_mode, cache)[0]
+    t0 = time.perf_counter()
+    total, _ = score_garden_optimized(garden, preferred_name, optimization_mode, cache)
+    stats.score_time += time.perf_counter() - t0
+    return total
+
+def score_move_delta(garden, pid, new_r, new_c, optimization_mode="balanced"):
+    """Score change of moving a plant, re-evaluating only the cells around its old and new footprint.
+
+    Returns None if the move is not possible. The garden is left unchanged.
+    The preferred plant bonus does not depend on position, so it never changes the delta.
+    """
+    weights = MODE_WEIGHTS.get(optimization_mode, MODE_WEIGHTS["balanced"])
+    meta = garden.placements.get(pid)
+    if meta is None or not garden.can_move(pid, new_r, new_c):
+        return None
+    old_r, old_c = meta["r"], meta["c"]
+    topo = get_topology(garden.rows, garden.cols)
+    cells = _move_cells(topo, meta, new_r, new_c)
+    before = _cells_score(garden, cells, weights, topo)
+    garden._relocate(pid, new_r, new_c)
+    delta = _cells_score(garden, cells, weights, topo) - before
+    garden._relocate(pid, old_r, old_c)
+    return delta
+
+def _preferred_bonus(name, preferred_name, optimization_mode):
+    """Preferred plant bonus one plant adds to the score"""
+    if name != preferred_name:
+        return 0.0
+    multiplier = 2.0 if optimization_mode == "low_maintenance" and CROPS[name]["effect"] in ["water", "weed"] else 1.0
+    return PREFERRED_WEIGHT * multiplier
+
+def place_with_delta(garden, name, top_r, top_c, preferred_name, optimization_mode="balanced"):
+    """Place a plant and return (pid, score change); (None, 0.0) if it does not fit.
+
+    Only the cells around the new plant are re-scored, so callers can keep a
+    running total in step with score_garden_optimized.
+    """
+    if not garden.can_place(name, top_r, top_c):
+        return None, 0.0
+    w, h = CROPS[name]["size"]
+    weights = MODE_WEIGHTS.get(optimization_mode, MODE_WEIGHTS["balanced"])
+    topo = get_topology(garden.rows, garden.cols)
+    cells = topo.region(w, h)[top_r][top_c]
+    before = _cells_score(garden, cells, weights, topo)
+    pid = garden.place(name, top_r, top_c)
+    after = _cells_score(garden, cells, weights, topo)
+    return pid, after - before + _preferred_bonus(name, preferred_name, optimization_mode)
+
+def remove_with_delta(garden, pid, preferred_name, optimization_mode="balanced"):
+    """Remove a plant and return the score change (0.0 if there is no such plant)"""
+    meta = garden.placements.get(pid)
+    if meta is None:
+        return 0.0
+    weights = MODE_WEIGHTS.get(optimization_mode, MODE_WEIGHTS["balanced"])
+    topo = get_topology(garden.rows, garden.cols)
+    cells = topo.region(meta["w"], meta["h"])[meta["r"]][meta["c"]]
+    before = _cells_score(garden, cells, weights, topo)
+    name = meta["name"]
+    garden.remove(pid)
+    after = _cells_score(garden, cells, weights, topo)
+    return after - before - _preferred_bonus(name, preferred_name, optimization_mode)
+
+class SearchStats:
+    """Counters and phase timings collected by an instrumented search or greedy fill.
+
+    Pass an instance as stats= to local_search_optimized (or another engine)
+    or greedy_fill_optimized; it keeps accumulating over several calls.
+    """
+
+    def __init__(self):
+        self.tried = 0          # candidate moves (greedy: plants to place)
+        self.infeasible = 0     # candidates blocked by other plants (greedy: no free spot)
+        self.accepted = 0       # candidates kept (greedy: plants placed)
+        self.improvements = 0   # times the best score rose
+        self.score_time = 0.0   # seconds spent scoring
+        self.clone_time = 0.0   # seconds spent cloning gardens
+        self.move_time = 0.0    # seconds spent checking, moving and placing plants
+        self.elapsed = 0.0      # total seconds
+        self.trace = []         # (elapsed seconds, best score) at the start and on every improvement
+
+    @property
+    def evals_per_sec(self):
+        """Candidates tried per second"""
+        return self.tried / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def acceptance_rate(self):
+        """Share of feasible candidates that were kept"""
+        feasible = self.tried - self.infeasible
+        return self.accepted / feasible if feasible else 0.0
+
+    def as_dict(self):
+        """Plain dict for JSON output and for passing between threads"""
+        return {
+            "tried": self.tried,
+            "infeasible": self.infeasible,
+            "accepted": self.accepted,
+            "improvements": self.improvements,
+            "score_seconds": round(self.score_time, 6),
+            "clone_seconds": round(self.clone_time, 6),
+            "move_seconds": round(self.move_time, 6),
+            "elapsed_seconds": round(self.elapsed, 6),
+            "evals_per_sec": round(self.evals_per_sec, 1),
+            "acceptance_rate": round(self.acceptance_rate, 4),
+            "trace": [(round(t, 6), round(score, 3)) for t, score in self.trace],
+        }
+
+    def summary(self):
+        """One-line description for the status bar and debug output"""
+        return describe_stats(self.as_dict())
+
+def describe_stats(stats):
+    """One-line description of a SearchStats.as_dict() (or optimize_anytime stats) dict"""
+    tried = stats.get("tried", 0)
+    elapsed = stats.get("elapsed_seconds") or 0.0
+    parts = [
+        f"{tried:,} tried ({stats.get('evals_per_sec', 0):,.0f}/s)",
+        f"{stats.get('infeasible', 0) / tried:.0%} infeasible" if tried else "0% infeasible",
+        f"{stats.get('acceptance_rate', 0):.0%} accepted",
+        f"{stats.get('improvements', 0)} improvements",
+    ]
+    if elapsed > 0:
+        parts.append(
+            f"scoring {stats.get('score_seconds', 0) / elapsed:.0%}, "
+            f"moving {stats.get('move_seconds', 0) / elapsed:.0%}, "
+            f"cloning {stats.get('clone_seconds', 0) / elapsed:.0%}"
+        )
+    if "cache" in stats:
+        parts.append(f"{stats['cache']['hit_rate']:.0%} cache hits")
+    return ", ".join(parts)
+
+def greedy_fill_optimized(garden, inventory, preferred_name, optimization_mode="balanced", rng=None, stats=None):
+    """Enhanced greedy fill with optimization mode priority.
+
+    rng is an optional random.Random used for the shuffle (defaults to the random module).
+    stats is an optional SearchStats: every plant counts as tried, plants that
+    do not fit as infeasible and placed ones as accepted.
+    """
+    rng = rng or random
+    started = time.perf_counter()
     to_place = []
     for name, cnt in inventory.items():
         for _ in range(cnt):
             to_place.append(name)
     
-    random.shuffle(to_place)
+    rng.shuffle(to_place)
     
     # Sort based on optimization mode
     def get_priority(name):
@@ -185,37 +933,692 @@ def greedy_fill_optimized(garden, inventory, preferred_name, optimization_mode="
     
     to_place.sort(key=get_priority, reverse=True)
     
+    placing = time.perf_counter()
+    placed = 0
     for name in to_place:
-        placed = False
-        for r in range(garden.rows):
-            for c in range(garden.cols):
-                if garden.can_place(name, r, c):
-                    garden.place(name, r, c)
-                    placed = True; break
-            if placed: break
+        anchor = garden.first_fit(name)
+        if anchor is not None:
+            garden.place(name, *anchor)
+            placed += 1
+    if stats is not None:
+        now = time.perf_counter()
+        stats.tried += len(to_place)
+        stats.infeasible += len(to_place) - placed
+        stats.accepted += placed
+        stats.move_time += now - placing
+        stats.elapsed += now - started
     return garden
 
-def local_search_optimized(garden, preferred_name, optimization_mode="balanced", iterations=3000):
-    """Enhanced local search with optimization mode"""
-    best = garden.clone()
-    best_score, _ = score_garden_optimized(best, preferred_name, optimization_mode)
-    pids = list(best.placements.keys())
-    if not pids:
-        return best, best_score
-    for _ in range(iterations):
-        pid = random.choice(pids)
-        meta = best.placements[pid]
-        nr = random.randrange(0, best.rows - meta["h"] + 1)
-        nc = random.randrange(0, best.cols - meta["w"] + 1)
-        cand = best.clone()
-        moved = cand.move(pid, nr, nc)
-        if not moved: continue
-        cand_score, _ = score_garden_optimized(cand, preferred_name, optimization_mode)
-        if cand_score >= best_score:
-            best, best_score = cand, cand_score
-            pids = list(best.placements.keys())
+def _iteration_range(iterations):
+    """range(iterations), or an endless counter when iterations is None"""
+    return itertools.count() if iterations is None else range(iterations)
+
+def _run_steps(steps, preferred_name, optimization_mode, trace, progress, stats=None, cache=None):
+    """Run an engine step generator to the end with the trace / progress / stats conventions.
+
+    Step generators yield (iterations done, best garden, best score, improved):
+    a tick (improved False) first and then every progress interval, and an
+    improvement whenever the best score rises. The yielded garden is live,
+    so consumers must copy it (to_layout / clone) to keep a snapshot.
+    """
+    start = time.perf_counter()
+    offset = stats.elapsed if stats is not None else 0.0
+    for done, best, best_score, improved in steps:
+        if improved:
+            now = time.perf_counter() - start
+            if trace is not None:
+                trace.append((now, best_score))
+            if stats is not None:
+                stats.improvements += 1
+                stats.trace.append((offset + now, best_score))
+            continue
+        if done == 0:
+            if trace is not None:
+                trace.append((0.0, best_score))
+            if stats is not None:
+                stats.trace.append((offset + time.perf_counter() - start, best_score))
+        if progress is not None and progress(done, best, best_score):
+            break
+    steps.close()
+    best.commit()
+    # rescore once so the returned value carries no accumulated rounding
+    best_score = _timed_score(best, preferred_name, optimization_mode, stats, cache)
+    if stats is not None:
+        stats.elapsed += time.perf_counter() - start
     return best, best_score
 
+def _random_move(garden, pids, rng, radius=None):
+    """Random relocation (pid, new_r, new_c) of one of pids, within radius rows / columns when given.
+
+    Draws use rng.random(), which is several times cheaper than randrange()
+    in the engines' inner loops.
+    """
+    random_ = rng.random
+    pid = pids[int(random_() * len(pids))]
+    meta = garden.placements[pid]
+    if radius is None:
+        return pid, int(random_() * (garden.rows - meta["h"] + 1)), int(random_() * (garden.cols - meta["w"] + 1))
+    r0 = max(0, meta["r"] - radius)
+    c0 = max(0, meta["c"] - radius)
+    r1 = min(garden.rows - meta["h"], meta["r"] + radius)
+    c1 = min(garden.cols - meta["w"], meta["c"] + radius)
+    return pid, r0 + int(random_() * (r1 - r0 + 1)), c0 + int(random_() * (c1 - c0 + 1))
+
+def _hill_climb_steps(garden, preferred_name, optimization_mode, iterations, rng, stats=None, cache=None,
+                      movable=None, radius=None):
+    """Step generator of local_search_optimized (see _run_steps)"""
+    best = _timed_clone(garden, stats)
+    best_score = _timed_score(best, preferred_name, optimization_mode, stats, cache)
+    pids = list(best.placements.keys()) if movable is None else [pid for pid in movable if pid in best.placements]
+    if not pids:
+        yield 0, best, best_score, False
+        return
+    weights = MODE_WEIGHTS.get(optimization_mode, MODE_WEIGHTS["balanced"])
+    scorer = _MoveScorer(best, weights, get_topology(best.rows, best.cols))
+    context = _score_context(best.rows, best.cols, preferred_name, optimization_mode)
+    for i in _iteration_range(iterations):
+        if i % PROGRESS_INTERVAL == 0:
+            yield i, best, best_score, False
+        pid, nr, nc = _random_move(best, pids, rng, radius)
+        delta = _move_delta(scorer, pid, nr, nc, stats, cache, context, best_score)
+        if delta is None or delta < -SCORE_EPS: continue
+        _apply_move(scorer, pid, nr, nc, stats)
+        if stats is not None:
+            stats.accepted += 1
+        if delta > SCORE_EPS:
+            best_score += delta
+            yield i + 1, best, best_score, True
+
+def local_search_optimized(garden, preferred_name, optimization_mode="balanced", iterations=3000, trace=None, rng=None,
+                           progress=None, stats=None, cache=None, movable=None, radius=None):
+    """Enhanced local search with optimization mode.
+
+    If trace is a list, (elapsed seconds, best score) is appended whenever the
+    best score improves, so engines can be compared on score over time.
+    rng is an optional random.Random (defaults to the random module).
+    progress is an optional callable(iterations done, best garden, best score)
+    called every PROGRESS_INTERVAL iterations from the searching thread; it
+    must not modify the garden, and returning True stops the search early.
+    stats is an optional SearchStats that receives move counts, phase timings
+    and the score trace.
+    cache is an optional ScoreCache (e.g. SCORE_CACHE): layouts the search
+    revisits are not rescored.
+    movable limits the moves to these placement ids and radius keeps every
+    move within radius rows / columns of the plant's current anchor.
+    """
+    steps = _hill_climb_steps(garden, preferred_name, optimization_mode, iterations, rng or random, stats, cache,
+                              movable=movable, radius=radius)
+    return _run_steps(steps, preferred_name, optimization_mode, trace, progress, stats, cache)
+
+def _exponential_schedule(t_start, t_end, progress):
+    """Geometric cooling from t_start to t_end"""
+    return t_start * (t_end / t_start) ** progress
+
+def _linear_schedule(t_start, t_end, progress):
+    """Linear cooling from t_start to t_end"""
+    return t_start + (t_end - t_start) * progress
+
+def _cosine_schedule(t_start, t_end, progress):
+    """Half-cosine cooling: slow at both ends, fast in the middle"""
+    return t_end + 0.5 * (t_start - t_end) * (1.0 + math.cos(math.pi * progress))
+
+# Temperature schedules for simulated_annealing: f(t_start, t_end, progress 0..1) -> temperature
+TEMPERATURE_SCHEDULES = {
+    "exponential": _exponential_schedule,
+    "linear": _linear_schedule,
+    "cosine": _cosine_schedule,
+}
+
+def _annealing_steps(garden, preferred_name, optimization_mode, iterations, rng, stats=None, cache=None,
+                     t_start=1.0, t_end=0.01, schedule="exponential", fraction=None):
+    """Step generator of simulated_annealing (see _run_steps).
+
+    fraction(i) gives the schedule position (0..1) of iteration i; it
+    defaults to i / iterations, or with iterations None to a reheat every
+    ANNEALING_PERIOD iterations.
+    """
+    cur = _timed_clone(garden, stats)
+    cur_score = _timed_score(cur, preferred_name, optimization_mode, stats, cache)
+    pids = list(cur.placements.keys())
+    if not pids:
+        yield 0, cur, cur_score, False
+        return
+    cool = TEMPERATURE_SCHEDULES[schedule] if isinstance(schedule, str) else schedule
+    if fraction is None:
+        if iterations is None:
+            fraction = lambda i: (i % ANNEALING_PERIOD) / ANNEALING_PERIOD
+        else:
+            fraction = lambda i: i / iterations
+    weights = MODE_WEIGHTS.get(optimization_mode, MODE_WEIGHTS["balanced"])
+    scorer = _MoveScorer(cur, weights, get_topology(cur.rows, cur.cols))
+    context = _score_context(cur.rows, cur.cols, preferred_name, optimization_mode)
+    best, best_score = _timed_clone(cur, stats), cur_score
+    for i in _iteration_range(iterations):
+        if i % PROGRESS_INTERVAL == 0:
+            yield i, best, best_score, False
+        temp = cool(t_start, t_end, fraction(i))
+        pid, nr, nc = _random_move(cur, pids, rng)
+        delta = _move_delta(scorer, pid, nr, nc, stats, cache, context, cur_score)
+        if delta is None: continue
+        if delta >= -SCORE_EPS or (temp > 0 and rng.random() < math.exp(delta / temp)):
+            _apply_move(scorer, pid, nr, nc, stats)
+            if stats is not None:
+                stats.accepted += 1
+            cur_score += delta
+            if cur_score > best_score + SCORE_EPS:
+                best, best_score = _timed_clone(cur, stats), cur_score
+                yield i + 1, best, best_score, True
+
+def simulated_annealing(garden, preferred_name, optimization_mode="balanced", iterations=3000,
+                        t_start=1.0, t_end=0.01, schedule="exponential", trace=None, rng=None, progress=None,
+                        stats=None, cache=None):
+    """Simulated annealing with a configurable temperature schedule.
+
+    Worse moves are accepted with probability exp(delta / temperature), which
+    lets the search leave plateaus that stall the hill climber. schedule is a
+    name from TEMPERATURE_SCHEDULES or a callable with the same signature.
+    Returns the best layout seen; trace, rng, progress, stats and cache work
+    as in local_search_optimized.
+    """
+    steps = _annealing_steps(garden, preferred_name, optimization_mode, iterations, rng or random, stats, cache,
+                             t_start=t_start, t_end=t_end, schedule=schedule)
+    return _run_steps(steps, preferred_name, optimization_mode, trace, progress, stats, cache)
+
+def _tabu_steps(garden, preferred_name, optimization_mode, iterations, rng, stats=None, cache=None,
+                sample_size=100, tenure=20, symmetric=True):
+    """Step generator of tabu_search (see _run_steps); ticks once per step"""
+    cur = _timed_clone(garden, stats)
+    cur_score = _timed_score(cur, preferred_name, optimization_mode, stats, cache)
+    pids = list(cur.placements.keys())
+    if not pids:
+        yield 0, cur, cur_score, False
+        return
+    weights = MODE_WEIGHTS.get(optimization_mode, MODE_WEIGHTS["balanced"])
+    topo = get_topology(cur.rows, cur.cols)
+    scorer = _MoveScorer(cur, weights, topo)
+    context = _score_context(cur.rows, cur.cols, preferred_name, optimization_mode)
+    best, best_score = _timed_clone(cur, stats), cur_score
+    tabu = {}  # (pid, r, c) -> last step in which moving there is forbidden
+    visited = {}  # canonical_key of a left layout -> last step in which returning to it is forbidden
+    if symmetric:
+        cur.track_symmetries()
+    for step in _iteration_range(None if iterations is None else max(1, iterations // sample_size)):
+        yield step * sample_size, best, best_score, False
+        candidates = []  # (delta, pid, r, c) of the feasible moves that are not tabu
+        for _ in range(sample_size):
+            pid, nr, nc = _random_move(cur, pids, rng)
+            meta = cur.placements[pid]
+            if nr == meta["r"] and nc == meta["c"]: continue
+            delta = _move_delta(scorer, pid, nr, nc, stats, cache, context, cur_score)
+            if delta is None: continue
+            if tabu.get((pid, nr, nc), -1) >= step and cur_score + delta <= best_score + SCORE_EPS:
+                continue
+            candidates.append((delta, pid, nr, nc))
+        # best first; the sort is stable, so ties keep the order they were sampled in
+        candidates.sort(key=lambda candidate: -candidate[0])
+        chosen = None
+        for delta, pid, nr, nc in candidates:
+            if not symmetric:
+                chosen = (delta, pid, nr, nc)
+                break
+            moved = min(_orbit_after_move(cur, pid, nr, nc))
+            if visited.get(moved, -1) < step or cur_score + delta > best_score + SCORE_EPS:
+                chosen = (delta, pid, nr, nc)
+                break
+        if chosen is None: continue
+        chosen_delta, pid, nr, nc = chosen
+        meta = cur.placements[pid]
+        tabu[(pid, meta["r"], meta["c"])] = step + tenure
+        if symmetric:
+            visited[canonical_key(cur)] = step + tenure
+        _apply_move(scorer, pid, nr, nc, stats)
+        cur_score += chosen_delta
+        if stats is not None:
+            stats.accepted += 1
+        if cur_score > best_score + SCORE_EPS:
+            best, best_score = _timed_clone(cur, stats), cur_score
+            yield (step + 1) * sample_size, best, best_score, True
+        if len(tabu) > 4 * tenure:
+            tabu = {key: until for key, until in tabu.items() if until >= step}
+        if len(visited) > 4 * tenure:
+            visited = {key: until for key, until in visited.items() if until >= step}
+
+def tabu_search(garden, preferred_name, optimization_mode="balanced", iterations=3000,
+                sample_size=100, tenure=20, trace=None, rng=None, progress=None, stats=None, cache=None,
+                symmetric=True):
+    """Tabu search over sampled relocation moves.
+
+    Each step evaluates sample_size random moves and takes the best one that
+    is not tabu, even if it lowers the score. After a plant moves, moving it
+    back to the cell it left is tabu for tenure steps, unless that would beat
+    the best layout found so far. With symmetric, returning within tenure
+    steps to a layout the search left, or to a mirrored / rotated copy of
+    it, is tabu as well. iterations counts evaluated candidates, so
+    budgets are comparable with the other engines. trace, rng, progress,
+    stats and cache work as in local_search_optimized; only the chosen move
+    of each step counts as accepted.
+    """
+    steps = _tabu_steps(garden, preferred_name, optimization_mode, iterations, rng or random, stats, cache,
+                        sample_size=sample_size, tenure=tenure, symmetric=symmetric)
+    return _run_steps(steps, preferred_name, optimization_mode, trace, progress, stats, cache)
+
+# Improvement engines selectable from the UI, all with the local_search_optimized signature
+SEARCH_ENGINES = {
+    "hill_climb": local_search_optimized,
+    "simulated_annealing": simulated_annealing,
+    "tabu_search": tabu_search,
+}
+
+# Step generators behind SEARCH_ENGINES, used by optimize_anytime
+ENGINE_STEPS = {
+    "hill_climb": _hill_climb_steps,
+    "simulated_annealing": _annealing_steps,
+    "tabu_search": _tabu_steps,
+}
+
+# Without a time budget or iteration limit, annealing reheats after this many iterations
+ANNEALING_PERIOD = 20000
+
+def optimize_anytime(garden, preferred_name, optimization_mode="balanced", engine="hill_climb",
+                     time_budget=None, target_score=None, stagnation=None, max_iterations=None,
+                     rng=None, progress=None, **options):
+    """Anytime search: yields (layout, score, stats) every time the best layout improves.
+
+    The first item is the starting layout. The search stops when time_budget
+    seconds have passed, the score reaches target_score, stagnation seconds
+    pass without an improvement, max_iterations candidates were evaluated or
+    progress(stats) returns True; at least one of these must be given. The
+    last item repeats the best layout with stats["stop_reason"] set to
+    "time", "target", "stagnation", "iterations" or "cancelled".
+    layout is a Garden.to_layout() dict; stats is a SearchStats.as_dict()
+    dict plus "engine", "iterations" and "stop_reason" (and "cache", the
+    ScoreCache.info() counters, when a cache option is given).
+    options are passed to the engine (e.g. schedule, sample_size); the input
+    garden is not modified. Annealing cools over the time budget, else over
+    max_iterations, else every ANNEALING_PERIOD iterations.
+    """
+    if time_budget is None and target_score is None and stagnation is None and max_iterations is None \
+            and progress is None:
+        raise ValueError("optimize_anytime needs a time budget, target score, stagnation or iteration limit")
+    started = time.perf_counter()
+    if engine == "simulated_annealing" and "fraction" not in options:
+        if time_budget:
+            options["fraction"] = lambda i: min(1.0, (time.perf_counter() - started) / time_budget)
+        elif max_iterations is None:
+            options["fraction"] = lambda i: (i % ANNEALING_PERIOD) / ANNEALING_PERIOD
+    search_stats = SearchStats()
+    steps = ENGINE_STEPS[engine](garden, preferred_name, optimization_mode, max_iterations, rng or random,
+                                 search_stats, **options)
+    iterations = 0
+    stop_reason = "iterations"
+
+    def snapshot():
+        search_stats.elapsed = time.perf_counter() - started
+        stats = search_stats.as_dict()
+        stats.update(engine=engine, iterations=iterations, stop_reason=None)
+        if options.get("cache") is not None:
+            stats["cache"] = options["cache"].info()
+        return stats
+
+    last_improved = started
+    best = None
+    best_score = None
+    for done, best, score, improved in steps:
+        now = time.perf_counter()
+        iterations = done
+        if improved or best_score is None:
+            if best_score is not None:
+                search_stats.improvements += 1
+            best_score = score
+            last_improved = now
+            search_stats.trace.append((now - started, best_score))
+            yield best.to_layout(), best_score, snapshot()
+        if target_score is not None and best_score >= target_score - SCORE_EPS:
+            stop_reason = "target"
+        elif time_budget is not None and now - started >= time_budget:
+            stop_reason = "time"
+        elif stagnation is not None and now - last_improved >= stagnation:
+            stop_reason = "stagnation"
+        elif not improved and progress is not None and progress(snapshot()):
+            stop_reason = "cancelled"
+        else:
+            continue
+        break
+    steps.close()
+    best.commit()
+    best_score = _timed_score(best, preferred_name, optimization_mode, search_stats, options.get("cache"))
+    if stop_reason == "iterations" and max_iterations is not None and best.placements:
+        iterations = max_iterations
+    stats = snapshot()
+    stats["stop_reason"] = stop_reason
+    yield best.to_layout(), best_score, stats
+
+class _BranchAndBound:
+    """Depth-first branch and bound behind solve_exact.
+
+    Cells are decided in row-major order: each free cell gets a plant
+    anchored there or stays empty. A cell is scored once its lower neighbor
+    is decided, so the running total only holds final cell scores. Nodes
+    are pruned when an admissible upper bound cannot beat the incumbent,
+    when an equal partial state (position, remaining inventory and every
+    cell not yet scored or next to one) was reached before with at least
+    the same total, and when the first row is the mirror image of a
+    smaller one (the mirrored layout scores the same).
+    """
+
+    def __init__(self, rows, cols, inventory, preferred_name, optimization_mode, place_all, deadline, progress):
+        self.rows, self.cols, self.n = rows, cols, rows * cols
+        self.place_all = place_all
+        self.deadline = deadline
+        self.progress = progress
+        weights = MODE_WEIGHTS.get(optimization_mode, MODE_WEIGHTS["balanced"])
+        effects = [eff for eff in BONUS_WEIGHT if weights.get(eff, 0.0) > 0]
+
+        # Crops to branch on: preferred first, then stronger effects and larger plants
+        def order(name):
+            eff = CROPS[name]["effect"]
+            w, h = CROPS[name]["size"]
+            return (name != preferred_name, -weights.get(eff, 0.0), -w * h, name)
+        self.names = sorted((name for name, cnt in inventory.items() if cnt > 0), key=order)
+        self.remaining = [inventory[name] for name in self.names]
+        self.area = [CROPS[name]["size"][0] * CROPS[name]["size"][1] for name in self.names]
+        self.perimeter_len = [2 * sum(CROPS[name]["size"]) for name in self.names]
+        self.bonus = [_preferred_bonus(name, preferred_name, optimization_mode) for name in self.names]
+        self.effect_bit = [1 << effects.index(CROPS[name]["effect"]) if CROPS[name]["effect"] in effects else 0
+                           for name in self.names]
+        # total weight of every combination of effects
+        self.mask_weight = [sum(weights[eff] for j, eff in enumerate(effects) if mask >> j & 1)
+                            for mask in range(1 << len(effects))]
+        self.effect_weights = [(1 << j, weights[eff]) for j, eff in enumerate(effects)]
+        # crop index of the only crop giving an effect, by effect bit (None if several or none do)
+        self.sole_provider = {}
+        for bit, _ in self.effect_weights:
+            providers = [k for k, effect_bit in enumerate(self.effect_bit) if effect_bit == bit]
+            self.sole_provider[bit] = providers[0] if len(providers) == 1 else None
+
+        topo = get_topology(rows, cols)
+        self.neighbors = topo.neighbors
+        self.mirror_row = "flip_cols" in topo.symmetries
+        # footprint cells, sorted perimeter cells and last possible anchor per crop
+        self.footprint = []
+        self.perimeter = []
+        self.last_anchor = []
+        for name in self.names:
+            w, h = CROPS[name]["size"]
+            cells, perims = [None] * self.n, [None] * self.n
+            for r in range(rows - h + 1):
+                for c in range(cols - w + 1):
+                    cells[r * cols + c] = tuple(rr * cols + cc for rr in range(r, r + h) for cc in range(c, c + w))
+                    perims[r * cols + c] = tuple(sorted(pr * cols + pc for pr, pc in topo.perimeter(w, h)[r][c]))
+            self.footprint.append(cells)
+            self.perimeter.append(perims)
+            self.last_anchor.append((rows - h) * cols + (cols - w))
+
+        # best possible score of a cell with d neighbors: the strongest distinct effects one per
+        # neighbor, leaving out the cell's own effect when only its own crop provides it
+        self.degree_cap = [0.0] * 5
+        for name in self.names:
+            own = CROPS[name]["effect"]
+            others = {CROPS[other]["effect"] for other in self.names if other != name}
+            available = sorted((weights[eff] for eff in {CROPS[other]["effect"] for other in self.names}
+                                if eff in effects and (eff != own or eff in others)), reverse=True)
+            for d in range(5):
+                self.degree_cap[d] = max(self.degree_cap[d], sum(available[:d]))
+        self.suffix_cap = [0.0] * (self.n + 1)
+        for x in range(self.n - 1, -1, -1):
+            self.suffix_cap[x] = self.suffix_cap[x + 1] + self.degree_cap[len(self.neighbors[x])]
+
+        self.crop_at = [-1] * self.n   # crop index per cell, -1 = empty or undecided
+        self.plant_at = [-1] * self.n  # anchor cell of the plant covering each cell
+        self.placed = []               # (effect bit, sorted perimeter cells) of every placed plant
+        self.free = self.n             # cells from the current one on that are not covered
+        self.remaining_area = sum(cnt * area for cnt, area in zip(self.remaining, self.area))
+        self.memo = {}  # None once dropped for never hitting
+        self.best_score = -math.inf
+        self.best_cells = None
+        self.open_bound = -math.inf    # best bound of the subtrees left unexplored when stopped
+        self.stop_reason = None
+        self.nodes = 0
+        self.bound_prunes = 0
+        self.memo_hits = 0
+        self.symmetry_prunes = 0
+
+    def cell_score(self, x):
+        """Final score of cell x (all its neighbors decided)"""
+        k = self.crop_at[x]
+        if k < 0:
+            return 0.0
+        crop_at, plant_at = self.crop_at, self.plant_at
+        plant = plant_at[x]
+        score = 0.0
+        got = 0
+        for y in self.neighbors[x]:
+            ky = crop_at[y]
+            if ky < 0 or plant_at[y] == plant:
+                continue
+            if ky == k:
+                score -= SAME_SPECIES_ADJ_PENALTY
+            else:
+                got |= self.effect_bit[ky]
+        return score + self.mask_weight[got]
+
+    def bound(self, i, total):
+        """Upper bound on the final score of any completion of the node at cell i"""
+        lo = i - self.cols if i > self.cols else 0
+        preferred = sum(cnt * bonus for cnt, bonus in zip(self.remaining, self.bonus))
+        cap = self.suffix_cap[lo]
+        if total + cap + preferred <= self.best_score + SCORE_EPS:
+            return total + cap + preferred
+        # only occupied cells score, and there are at most this many of them left to score
+        cells = [cnt * area for cnt, area in zip(self.remaining, self.area)]  # per crop
+        crop_at = self.crop_at
+        for x in range(lo, self.n):
+            if crop_at[x] >= 0:
+                cells[crop_at[x]] += 1
+        occupied = sum(cells)
+        cap = min(cap, occupied * self.degree_cap[4])
+        # every (cell, effect) bonus still to be scored needs a plant with that effect next to the
+        # cell, and a cell of the only crop giving an effect cannot receive it
+        supply = {bit: 0 for bit, _ in self.effect_weights}
+        for k, cnt in enumerate(self.remaining):
+            if cnt and self.effect_bit[k]:
+                supply[self.effect_bit[k]] += cnt * self.perimeter_len[k]
+        for bit, perimeter in self.placed:
+            if bit and perimeter and perimeter[-1] >= lo:
+                supply[bit] += len(perimeter) - bisect.bisect_left(perimeter, lo)
+        by_supply = 0.0
+        for bit, weight in self.effect_weights:
+            sole = self.sole_provider[bit]
+            receivers = occupied - cells[sole] if sole is not None else occupied
+            by_supply += weight * min(receivers, supply[bit])
+        return total + min(cap, by_supply) + preferred
+
+    def tick(self):
+        """Check the deadline and progress callback; True when the search must stop"""
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            self.stop_reason = "time"
+        elif self.progress is not None and self.progress(self.nodes, self.best_layout(), self.best_score):
+            self.stop_reason = "cancelled"
+        return self.stop_reason is not None
+
+    def best_layout(self):
+        """Garden.to_layout() dict of the incumbent, or None"""
+        if self.best_cells is None:
+            return None
+        crop_at, plant_at = self.best_cells
+        plants = [[self.names[crop_at[x]], x // self.cols, x % self.cols]
+                  for x in range(self.n) if plant_at[x] == x]
+        return {"rows": self.rows, "cols": self.cols, "plants": plants}
+
+    def leaf(self, total):
+        """Score a complete layout and keep it if it beats the incumbent"""
+        for x in range(self.n - self.cols, self.n):
+            total += self.cell_score(x)
+        if self.place_all and any(self.remaining):
+            return
+        if total > self.best_score + SCORE_EPS:
+            self.best_score = total
+            self.best_cells = (self.crop_at[:], self.plant_at[:])
+
+    def choices(self, i):
+        """Crop indices that can be anchored at free cell i, then None (leave it empty) if allowed"""
+        options = []
+        for k, cnt in enumerate(self.remaining):
+            if cnt and self.footprint[k][i] is not None and all(self.crop_at[x] < 0 for x in self.footprint[k][i]):
+                options.append(k)
+        if not self.place_all or self.free - 1 >= self.remaining_area:
+            options.append(None)
+        return options
+
+    def apply(self, i, k):
+        """Anchor crop k at cell i (k None: leave cell i empty)"""
+        if k is None:
+            self.free -= 1
+            return
+        for x in self.footprint[k][i]:
+            self.crop_at[x] = k
+            self.plant_at[x] = i
+        self.remaining[k] -= 1
+        self.remaining_area -= self.area[k]
+        self.free -= self.area[k]
+        self.placed.append((self.effect_bit[k], self.perimeter[k][i]))
+
+    def undo(self, i, k):
+        """Revert apply(i, k)"""
+        if k is None:
+            self.free += 1
+            return
+        for x in self.footprint[k][i]:
+            self.crop_at[x] = -1
+            self.plant_at[x] = -1
+        self.remaining[k] += 1
+        self.remaining_area += self.area[k]
+        self.free += self.area[k]
+        self.placed.pop()
+
+    def search(self, i, total):
+        """Explore every completion of the node at cell i whose finished cells score total"""
+        cols = self.cols
+        start = i
+        # skip cells covered by plants anchored earlier, scoring the cells above them
+        while i < self.n and self.crop_at[i] >= 0:
+            if i >= cols:
+                total += self.cell_score(i - cols)
+            i += 1
+        if i == self.n:
+            self.leaf(total)
+            return
+        self.nodes += 1
+        if self.nodes % 1024 == 0 and self.tick():
+            self.open_bound = max(self.open_bound, self.bound(i, total))
+            return
+        if self.mirror_row and start <= cols <= i:
+            # first row complete: keep only the smaller of it and its mirror image
+            row = self.crop_at[:cols]
+            if row[::-1] < row:
+                self.symmetry_prunes += 1
+                return
+        if self.place_all:
+            if self.remaining_area > self.free:
+                return
+            for k, cnt in enumerate(self.remaining):
+                if cnt and i > self.last_anchor[k]:
+                    return
+        if self.bound(i, total) <= self.best_score + SCORE_EPS:
+            self.bound_prunes += 1
+            return
+        if self.memo is not None:
+            lo = i - 2 * cols if i > 2 * cols else 0
+            key = (i, tuple(self.remaining), tuple(self.crop_at[lo:]), tuple(self.plant_at[lo:]))
+            seen = self.memo.get(key)
+            if seen is not None and seen >= total - SCORE_EPS:
+                self.memo_hits += 1
+                return
+            if seen is not None or len(self.memo) < EXACT_MEMO_LIMIT:
+                self.memo[key] = total
+            if not self.memo_hits and len(self.memo) >= EXACT_MEMO_PROBE:
+                # dense plots rarely repeat a state; the memo would only cost memory
+                self.memo = None
+        options = self.choices(i)
+        for index, k in enumerate(options):
+            self.apply(i, k)
+            gain = self.bonus[k] if k is not None else 0.0
+            if i >= cols:
+                gain += self.cell_score(i - cols)
+            self.search(i + 1, total + gain)
+            self.undo(i, k)
+            if self.stop_reason is not None:
+                # the unexplored siblings bound what the search may have missed
+                for other in options[index + 1:]:
+                    self.apply(i, other)
+                    gain = self.bonus[other] if other is not None else 0.0
+                    if i >= cols:
+                        gain += self.cell_score(i - cols)
+                    self.open_bound = max(self.open_bound, self.bound(i + 1, total + gain))
+                    self.undo(i, other)
+                return
+
+def solve_exact(garden, preferred_name, optimization_mode="balanced", inventory=None, time_limit=10.0,
+                progress=None, place_all=None):
+    """Optimal layout of a small plot by branch and bound, with a certificate.
+
+    Without an inventory the plants already in the garden are rearranged
+    (all of them must be placed); with one, up to inventory[name] plants of
+    each crop are placed on an empty plot (place_all=True requires every
+    plant to fit). The search starts from the garden's layout (or a greedy
+    fill) as incumbent and stops after time_limit seconds or when
+    progress(nodes, best layout, best score) returns True, keeping the best
+    layout found. Plots are limited to EXACT_MAX_CELLS cells.
+    Returns (best garden, best score, certificate); the certificate holds
+    "optimal", "nodes", the prune counts, "upper_bound" (no layout scores
+    more) and "gap" (upper_bound - best score, 0 when optimal).
+    """
+    rows, cols = garden.rows, garden.cols
+    if rows * cols > EXACT_MAX_CELLS:
+        raise ValueError(f"The exact solver handles plots of up to {EXACT_MAX_CELLS} cells, not {rows}x{cols}")
+    started = time.perf_counter()
+    if inventory is None:
+        inventory = Counter(meta["name"] for meta in garden.placements.values())
+        incumbent = garden.clone()
+        place_all = True if place_all is None else place_all
+    else:
+        inventory = {name: int(cnt) for name, cnt in inventory.items() if cnt > 0}
+        incumbent = create_garden(rows, cols)
+        greedy_fill_optimized(incumbent, inventory, preferred_name, optimization_mode, rng=random.Random(0))
+        incumbent, _ = local_search_optimized(incumbent, preferred_name, optimization_mode, rng=random.Random(0))
+        place_all = bool(place_all)
+    deadline = started + time_limit if time_limit is not None else None
+    solver = _BranchAndBound(rows, cols, inventory, preferred_name, optimization_mode, place_all, deadline, progress)
+    if not place_all or len(incumbent.placements) == sum(inventory.values()):
+        solver.best_score = score_garden_optimized(incumbent, preferred_name, optimization_mode, cache=None)[0]
+    solver.search(0, 0.0)
+
+    layout = solver.best_layout()
+    if layout is not None:
+        best = create_garden(rows, cols)
+        best.load_layout(layout)
+    else:
+        best = incumbent
+    best_score, _ = score_garden_optimized(best, preferred_name, optimization_mode)
+    optimal = solver.stop_reason is None and solver.best_score > -math.inf
+    if solver.best_score == -math.inf:
+        upper_bound = solver.open_bound  # no layout placing every plant was found
+    else:
+        upper_bound = best_score if optimal else max(best_score, solver.open_bound)
+    certificate = {
+        "optimal": optimal,
+        "stop_reason": solver.stop_reason or "optimal",
+        "nodes": solver.nodes,
+        "bound_prunes": solver.bound_prunes,
+        "memo_hits": solver.memo_hits,
+        "symmetry_prunes": solver.symmetry_prunes,
+        "best_score": round(best_score, 3),
+        "upper_bound": round(upper_bound, 3) if upper_bound > -math.inf else None,
+        "gap": round(upper_bound - best_score, 3) if upper_bound > -math.inf else None,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+    return best, best_score, certificate
+
 # Legacy compatibility functions
 def greedy_fill(garden, inventory, preferred_name):
     """Legacy greedy fill function"""
@@ -226,32 +1629,11 @@ def greedy_fill(garden, inventory, preferred_name):
     random.shuffle(to_place)
     to_place.sort(key=lambda nm: (nm != preferred_name, -CROPS[nm]["size"][0]*CROPS[nm]["size"][1]))
     for name in to_place:
-        placed = False
-        for r in range(garden.rows):
-            for c in range(garden.cols):
-                if garden.can_place(name, r, c):
-                    garden.place(name, r, c)
-                    placed = True; break
-            if placed: break
+        anchor = garden.first_fit(name)
+        if anchor is not None:
+            garden.place(name, *anchor)
     return garden
 
 def local_search(garden, preferred_name, iterations=3000):
     """Legacy local search function"""
-    best = garden.clone()
-    best_score, _ = score_garden_optimized(best, preferred_name, "balanced")
-    pids = list(best.placements.keys())
-    if not pids:
-        return best, best_score
-    for _ in range(iterations):
-        pid = random.choice(pids)
-        meta = best.placements[pid]
-        nr = random.randrange(0, best.rows - meta["h"] + 1)
-        nc = random.randrange(0, best.cols - meta["w"] + 1)
-        cand = best.clone()
-        moved = cand.move(pid, nr, nc)
-        if not moved: continue
-        cand_score, _ = score_garden_optimized(cand, preferred_name, "balanced")
-        if cand_score >= best_score:
-            best, best_score = cand, cand_score
-            pids = list(best.placements.keys())
-    return best, best_score
+    return local_search_optimized(garden, preferred_name, "balanced", iterations)
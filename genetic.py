@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Genetic (population-based) optimizer for Palia Garden Optimizer
+"""
+
+import os
+import time
+import random
+from collections import Counter
+
+from garden import (create_garden, garden_from_layout, greedy_fill_optimized, local_search_optimized,
+                    score_garden_optimized, canonical_key, SCORE_CACHE, SCORE_EPS)
+
+GENETIC_ENGINE = "genetic"
+POPULATION_SIZE = 24
+TOURNAMENT_SIZE = 3
+# Random Garden.move attempts applied to every child
+MUTATION_MOVES = 3
+# Hill climbing moves that polish every child before it is scored
+POLISH_ITERATIONS = 200
+# Generations when no time budget is given
+DEFAULT_GENERATIONS = 30
+
+def crossover(parent_a, parent_b, inventory, preferred_name, optimization_mode="balanced", rng=None):
+    """Child with parent_a's plants inside a random rectangle and parent_b's outside it.
+
+    Plants are taken by their anchor cell. parent_b plants that collide with
+    the rectangle's plants, or exceed the inventory, are dropped and the
+    left-over inventory is placed again by greedy_fill_optimized.
+    """
+    rng = rng or random
+    rows, cols = parent_a.rows, parent_a.cols
+    r0 = rng.randrange(rows); r1 = rng.randrange(r0 + 1, rows + 1)
+    c0 = rng.randrange(cols); c1 = rng.randrange(c0 + 1, cols + 1)
+    child = create_garden(rows, cols)
+    left = Counter(inventory)
+    for meta in parent_a.placements.values():
+        if r0 <= meta["r"] < r1 and c0 <= meta["c"] < c1 and left[meta["name"]] > 0:
+            if child.place(meta["name"], meta["r"], meta["c"]) is not None:
+                left[meta["name"]] -= 1
+    for meta in parent_b.placements.values():
+        if (r0 <= meta["r"] < r1 and c0 <= meta["c"] < c1) or left[meta["name"]] <= 0:
+            continue
+        if child.place(meta["name"], meta["r"], meta["c"]) is not None:
+            left[meta["name"]] -= 1
+    greedy_fill_optimized(child, +left, preferred_name, optimization_mode, rng=rng)
+    return child
+
+def mutate(garden, moves=MUTATION_MOVES, rng=None):
+    """Try moves random relocations with Garden.move; returns how many succeeded"""
+    rng = rng or random
+    pids = list(garden.placements)
+    moved = 0
+    if not pids:
+        return moved
+    for _ in range(moves):
+        pid = rng.choice(pids)
+        meta = garden.placements[pid]
+        if garden.move(pid, rng.randrange(garden.rows - meta["h"] + 1), rng.randrange(garden.cols - meta["w"] + 1)):
+            moved += 1
+    return moved
+
+def _breed(job):
+    """Build, mutate, polish and score one individual; returns (score, canonical key, layout).
+
+    Without parents the individual is a greedy fill of the inventory (or the
+    start layout when there is no inventory); with one parent it is a mutated
+    copy and with two a crossover child.
+    """
+    start, parent_a, parent_b, inventory, preferred_name, optimization_mode, mutation_moves, polish, seed = job
+    rng = random.Random(seed)
+    if parent_b is not None:
+        child = crossover(garden_from_layout(parent_a), garden_from_layout(parent_b), inventory,
+                          preferred_name, optimization_mode, rng=rng)
+    elif parent_a is not None:
+        child = garden_from_layout(parent_a)
+    else:
+        child = garden_from_layout(start)
+        if inventory is not None:
+            child.clear()
+            greedy_fill_optimized(child, inventory, preferred_name, optimization_mode, rng=rng)
+    mutate(child, mutation_moves, rng)
+    if polish:
+        child, score = local_search_optimized(child, preferred_name, optimization_mode, iterations=polish, rng=rng,
+                                              cache=SCORE_CACHE)
+    else:
+        score, _ = score_garden_optimized(child, preferred_name, optimization_mode)
+    return score, canonical_key(child), child.to_layout()
+
+def _select(population, rng):
+    """Tournament selection over a population sorted best first"""
+    return population[min(rng.randrange(len(population)) for _ in range(TOURNAMENT_SIZE))]
+
+def genetic_search(garden, preferred_name, optimization_mode="balanced", inventory=None,
+                   population_size=POPULATION_SIZE, generations=None, time_budget=None,
+                   mutation_moves=MUTATION_MOVES, polish=POLISH_ITERATIONS, seed=None, max_workers=None,
+                   trace=None, progress=None):
+    """Evolve a population of layouts with region crossover and move mutation.
+
+    The first population is greedy fills of the inventory with different
+    seeds (mutated copies of the garden's layout when inventory is None, in
+    which case the garden's plants are the inventory). Every generation
+    breeds population_size children from tournament-selected parents; the
+    best distinct layouts of parents and children survive, with mirrored /
+    rotated copies counted as one. Children are built and scored in
+    max_workers processes (all cores by default) and score with the same
+    modes as score_garden_optimized.
+    Stops after time_budget seconds, after generations (DEFAULT_GENERATIONS
+    without a time budget) or when progress(generation, best garden, best
+    score) returns True; trace gets (elapsed seconds, best score) on every
+    improvement. Returns (best garden, best score); the input garden is not
+    modified.
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    if generations is None and time_budget is None:
+        generations = DEFAULT_GENERATIONS
+    start = garden.to_layout()
+    if inventory is None:
+        # mutated copies of the current layout (the first one unchanged)
+        inventory = dict(Counter(meta["name"] for meta in garden.placements.values()))
+        jobs = [(start, start, None, None, preferred_name, optimization_mode, 4 * mutation_moves if i else 0, polish,
+                 rng.randrange(2**32)) for i in range(population_size)]
+    else:
+        jobs = [(start, None, None, inventory, preferred_name, optimization_mode, mutation_moves if i else 0, polish,
+                 rng.randrange(2**32)) for i in range(population_size)]
+
+    cpus = os.cpu_count() or 1
+    max_workers = min(max_workers or cpus, population_size)
+    pool = None
+    if max_workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+    chunksize = max(1, population_size // (2 * max_workers))
+    evaluate = (lambda jobs: list(pool.map(_breed, jobs, chunksize=chunksize))) if pool else \
+        (lambda jobs: [_breed(job) for job in jobs])
+
+    def survivors(individuals):
+        # best first, one per canonical layout
+        distinct = {}
+        for individual in individuals:
+            score, key, _ = individual
+            if key not in distinct or score > distinct[key][0]:
+                distinct[key] = individual
+        return sorted(distinct.values(), key=lambda individual: -individual[0])[:population_size]
+
+    try:
+        population = survivors(evaluate(jobs))
+        best_score = population[0][0]
+        if trace is not None:
+            trace.append((time.perf_counter() - started, best_score))
+        generation = 0
+        while True:
+            if generations is not None and generation >= generations:
+                break
+            if time_budget is not None and time.perf_counter() - started >= time_budget:
+                break
+            if progress is not None and progress(generation, garden_from_layout(population[0][2]), best_score):
+                break
+            jobs = [(start, _select(population, rng)[2], _select(population, rng)[2], inventory, preferred_name,
+                     optimization_mode, mutation_moves, polish, rng.randrange(2**32))
+                    for _ in range(population_size)]
+            population = survivors(population + evaluate(jobs))
+            generation += 1
+            if population[0][0] > best_score + SCORE_EPS:
+                best_score = population[0][0]
+                if trace is not None:
+                    trace.append((time.perf_counter() - started, best_score))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    best = create_garden(garden.rows, garden.cols)
+    best.load_layout(population[0][2])
+    best_score, _ = score_garden_optimized(best, preferred_name, optimization_mode)
+    return best, best_score
@@ -8,6 +8,7 @@ import os
 import json
 import glob
 import sys
+from collections.abc import Mapping
 
 def get_resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -18,45 +19,82 @@ def get_resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-def load_languages():
-    """Load all language files from the lang directory"""
-    languages = {}
-    lang_dir = get_resource_path('lang')
-    
-    if not os.path.exists(lang_dir):
-        print(f"Warning: Language directory {lang_dir} not found!")
-        return {}
-    
-    # Find all JSON files in lang directory
-    lang_files = glob.glob(os.path.join(lang_dir, '*.json'))
-    
-    for lang_file in lang_files:
+# Small code -> display name table read at startup instead of every language file
+INDEX_FILE = "index.json"
+
+def read_language_file(lang_file):
+    """Parse one language file; returns the dict or raises ValueError"""
+    # Try UTF-8-sig first (handles BOM), then UTF-8
+    for encoding in ['utf-8-sig', 'utf-8']:
         try:
-            # Try UTF-8-sig first (handles BOM), then UTF-8
-            lang_data = None
-            for encoding in ['utf-8-sig', 'utf-8']:
-                try:
-                    with open(lang_file, 'r', encoding=encoding) as f:
-                        lang_data = json.load(f)
-                    break
-                except (UnicodeDecodeError, json.JSONDecodeError):
-                    continue
-            
-            if lang_data is None:
-                raise ValueError("Could not decode file or invalid JSON")
-                
-            # Use language_code from the file, or filename as fallback
-            lang_code = lang_data.get('language_code', os.path.splitext(os.path.basename(lang_file))[0])
-            languages[lang_code] = lang_data
-            print(f"Loaded language: {lang_data.get('language_name', lang_code)} ({lang_code})")
-            
+            with open(lang_file, 'r', encoding=encoding) as f:
+                return json.load(f)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            continue
+    raise ValueError("Could not decode file or invalid JSON")
+
+class LanguageRegistry(Mapping):
+    """Language tables by code, parsed on first access and then cached.
+
+    Only lang/index.json (code -> display name) is read up front. Language
+    files missing from the index are still found by file name and shown by
+    their code.
+    """
+
+    def __init__(self, lang_dir=None):
+        self.lang_dir = lang_dir or get_resource_path('lang')
+        self._index = None
+        self._tables = {}
+
+    @property
+    def index(self):
+        """Language code -> display name"""
+        if self._index is None:
+            self._index = self._read_index()
+        return self._index
+
+    def _read_index(self):
+        if not os.path.exists(self.lang_dir):
+            print(f"Warning: Language directory {self.lang_dir} not found!")
+            return {}
+        index = {}
+        try:
+            with open(os.path.join(self.lang_dir, INDEX_FILE), 'r', encoding='utf-8-sig') as f:
+                index = json.load(f)
         except Exception as e:
-            print(f"Error loading language file {lang_file}: {e}")
-    
-    return languages
+            print(f"Warning: Could not read language index: {e}")
+        for lang_file in glob.glob(os.path.join(self.lang_dir, '*.json')):
+            code = os.path.splitext(os.path.basename(lang_file))[0]
+            if lang_file.endswith(INDEX_FILE) or code in index:
+                continue
+            index[code] = code.upper()
+        return index
+
+    def display_names(self):
+        """Language code -> display name, without loading any language file"""
+        return dict(self.index)
+
+    def __getitem__(self, code):
+        if code not in self._tables:
+            if code not in self.index:
+                raise KeyError(code)
+            lang_file = os.path.join(self.lang_dir, f"{code}.json")
+            try:
+                self._tables[code] = read_language_file(lang_file)
+                print(f"Loaded language: {self._tables[code].get('language_name', code)} ({code})")
+            except Exception as e:
+                print(f"Error loading language file {lang_file}: {e}")
+                self._tables[code] = {}
+        return self._tables[code]
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
 
-# Load all available languages on module import
-LANGUAGES = load_languages()
+# Available languages; each file is parsed the first time it is used
+LANGUAGES = LanguageRegistry()
 
 class LanguageManager:
     """Manages language switching and text retrieval"""
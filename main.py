@@ -6,8 +6,337 @@ Created by: Kallós László 2025, Palia 0.194
 """
 
 import sys
+import json
+import random
 import argparse
-from palia_garden_optimizer import App
+import os
+import hashlib
+import itertools
+import time
+
+# Search options that, with the plot itself, identify a finished batch result
+BATCH_OPTIONS = ("mode", "engine", "time", "target", "stagnation", "iterations", "tiles", "no_patterns", "seed")
+
+def parse_duration(text):
+    """Parse a duration like '5s', '500ms', '2m' or '3.5' (seconds) into seconds"""
+    text = text.strip().lower()
+    for suffix, scale in (("ms", 0.001), ("s", 1.0), ("m", 60.0)):
+        if text.endswith(suffix):
+            return float(text[:-len(suffix)]) * scale
+    return float(text)
+
+def load_plot(path):
+    """Read a plot definition (palia_config.json format)"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        return json.load(f)
+
+def optimize_plot(plot, args, max_workers=None):
+    """Generate and optimize one plot definition; returns the JSON result dict.
+
+    Only imports the garden logic, never Tkinter. Raises ValueError for an
+    invalid plot or option combination. max_workers limits the processes of
+    the genetic and tiled searches (all cores by default).
+    """
+    from crops import CROPS
+    from garden import (create_garden, greedy_fill_optimized, score_garden_optimized, optimize_anytime,
+                        describe_stats, SearchStats, SEARCH_ENGINES, SCORE_CACHE, EXACT_ENGINE)
+    from genetic import GENETIC_ENGINE
+    from patterns import warm_start
+
+    inventory = {name: max(0, int(cnt)) for name, cnt in plot.get("inventory", {}).items()}
+    unknown = [name for name in inventory if name not in CROPS]
+    if unknown:
+        raise ValueError(f"unknown crops in inventory: {', '.join(unknown)}")
+    pref = plot.get("preferred_plant", "Apple")
+    opt_mode = args.mode or plot.get("optimization_mode", "balanced")
+    engine = args.engine or plot.get("search_engine", "hill_climb")
+    if engine not in SEARCH_ENGINES and engine not in (GENETIC_ENGINE, EXACT_ENGINE):
+        raise ValueError(f"unknown search engine '{engine}'")
+    budget = parse_duration(args.time) if args.time else None
+    stagnation = parse_duration(args.stagnation) if args.stagnation else None
+    max_iterations = args.iterations
+    if budget is None and stagnation is None and args.target is None and max_iterations is None:
+        max_iterations = 4000
+    rng = random.Random(args.seed)
+
+    started = time.perf_counter()
+    # scores of the previous plot are no use here
+    SCORE_CACHE.clear()
+    garden = create_garden(int(plot.get("rows", 9)), int(plot.get("cols", 9)))
+    if engine == EXACT_ENGINE:
+        return search_exact(args, garden, inventory, pref, opt_mode, budget, started)
+    if engine == GENETIC_ENGINE:
+        return search_genetic(args, garden, inventory, pref, opt_mode, budget, started, max_workers)
+    if args.tiles:
+        return search_tiled(args, garden, inventory, pref, opt_mode, engine, budget, max_iterations, started,
+                            max_workers)
+    fill_stats = SearchStats()
+    copies = 0
+    if args.no_patterns:
+        greedy_fill_optimized(garden, inventory, pref, opt_mode, rng=rng, stats=fill_stats)
+    else:
+        copies = warm_start(garden, inventory, pref, opt_mode, rng=rng, stats=fill_stats)
+    if args.debug:
+        print(f"greedy fill: {fill_stats.accepted} of {fill_stats.tried} plants placed in {fill_stats.elapsed:.3f}s, "
+              f"{copies} pattern copies used", file=sys.stderr)
+    for layout, score, stats in optimize_anytime(garden, pref, opt_mode, engine, time_budget=budget,
+                                               target_score=args.target, stagnation=stagnation,
+                                               max_iterations=max_iterations, rng=rng, cache=SCORE_CACHE):
+        if args.debug:
+            print(f"[{stats['elapsed_seconds']:.3f}s] score {score:.3f}", file=sys.stderr)
+    if args.debug:
+        print(f"search: {describe_stats(stats)}", file=sys.stderr)
+    elapsed = time.perf_counter() - started
+    garden.load_layout(layout)
+    total, metrics = score_garden_optimized(garden, pref, opt_mode)
+
+    return {
+        "layout": layout,
+        "metrics": metrics,
+        "search_engine": engine,
+        "stop_reason": stats["stop_reason"],
+        "elapsed_seconds": round(elapsed, 3),
+        "pattern_copies": copies,
+        "stats": {"greedy_fill": fill_stats.as_dict(), "search": stats},
+    }
+
+def run_optimize(args):
+    """Headless generate + optimize of one plot, printing JSON"""
+    try:
+        plot = load_plot(args.config)
+    except Exception as e:
+        print(f"Error loading config: {e}", file=sys.stderr)
+        return 1
+    try:
+        result = optimize_plot(plot, args)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return write_result(args, result)
+
+def write_result(args, result):
+    """Print the JSON result or save it to --out"""
+    text = json.dumps(result, indent=2)
+    if args.out:
+        try:
+            with open(args.out, 'w', encoding='utf-8') as f:
+                f.write(text + "\n")
+        except Exception as e:
+            print(f"Error saving layout: {e}", file=sys.stderr)
+            return 1
+    else:
+        print(text)
+    return 0
+
+def search_tiled(args, garden, inventory, pref, opt_mode, engine, budget, iterations, started, max_workers=None):
+    """Headless tiled optimization of a large plot; tiles are searched on max_workers cores (default all)"""
+    from garden import score_garden_optimized
+    from parallel import tiled_optimize
+
+    if budget is None and iterations is None:
+        raise ValueError("--tiles needs --time or --iterations")
+    best, score = tiled_optimize(garden, pref, opt_mode, inventory=inventory, engine=engine, tile_size=args.tiles,
+                                 iterations=iterations, time_budget=budget, seed=args.seed,
+                                 max_workers=max_workers, patterns=not args.no_patterns)
+    if args.debug:
+        print(f"tiled: {len(best.placements)} plants, score {score:.3f}", file=sys.stderr)
+    _, metrics = score_garden_optimized(best, pref, opt_mode)
+    return {
+        "layout": best.to_layout(),
+        "metrics": metrics,
+        "search_engine": engine,
+        "tile_size": args.tiles,
+        "stop_reason": "time" if budget is not None else "iterations",
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+
+def search_genetic(args, garden, inventory, pref, opt_mode, budget, started, max_workers=None):
+    """Headless population search; children are evaluated on max_workers cores (default all)"""
+    from garden import score_garden_optimized
+    from genetic import genetic_search, GENETIC_ENGINE
+
+    trace = []
+    best, score = genetic_search(garden, pref, opt_mode, inventory=inventory, time_budget=budget,
+                                 seed=args.seed, max_workers=max_workers, trace=trace)
+    if args.debug:
+        for elapsed, best_score in trace:
+            print(f"[{elapsed:.3f}s] score {best_score:.3f}", file=sys.stderr)
+    _, metrics = score_garden_optimized(best, pref, opt_mode)
+    return {
+        "layout": best.to_layout(),
+        "metrics": metrics,
+        "search_engine": GENETIC_ENGINE,
+        "stop_reason": "time" if budget is not None else "generations",
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "score_trace": [[round(elapsed, 3), best_score] for elapsed, best_score in trace],
+    }
+
+def search_exact(args, garden, inventory, pref, opt_mode, budget, started):
+    """Headless branch and bound for small plots; the result carries the optimality certificate"""
+    from garden import score_garden_optimized, solve_exact, EXACT_ENGINE
+
+    best, score, certificate = solve_exact(garden, pref, opt_mode, inventory=inventory,
+                                           time_limit=budget if budget is not None else 10.0)
+    if args.debug:
+        print(f"exact: {certificate}", file=sys.stderr)
+    _, metrics = score_garden_optimized(best, pref, opt_mode)
+    return {
+        "layout": best.to_layout(),
+        "metrics": metrics,
+        "search_engine": EXACT_ENGINE,
+        "stop_reason": certificate["stop_reason"],
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "certificate": certificate,
+    }
+
+def batch_sources(source):
+    """(id, plot or path) pairs from a directory of *.json files, or from stdin for '-'.
+
+    Stdin lines are either a plot definition as one JSON object (its id is
+    its "name", else stdin:<line number>) or the path of a config file. A
+    line that is not valid JSON gets the ValueError as its source, so it is
+    reported as its own error record (see load_source).
+    """
+    if source != "-":
+        return [(name, os.path.join(source, name))
+                for name in sorted(os.listdir(source)) if name.lower().endswith(".json")]
+    sources = []
+    for number, line in enumerate(sys.stdin, 1):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            try:
+                plot = json.loads(line)
+            except ValueError as e:
+                sources.append((f"stdin:{number}", ValueError(f"invalid JSON: {e}")))
+                continue
+            sources.append((str(plot.get("name", f"stdin:{number}")), plot))
+        else:
+            sources.append((line, line))
+    return sources
+
+def load_source(source):
+    """Plot definition of a batch source: the plot itself, a config path, or the error reading it"""
+    if isinstance(source, Exception):
+        raise source
+    return source if isinstance(source, dict) else load_plot(source)
+
+def config_hash(plot, args):
+    """Short hash of a plot and the search options, so changed configs are optimized again on resume"""
+    options = {key: getattr(args, key) for key in BATCH_OPTIONS}
+    text = json.dumps({"plot": plot, "options": options}, sort_keys=True)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+def finished_configs(path):
+    """{id: config hash} of the successful results already in a JSON Lines file"""
+    finished = {}
+    if not path or not os.path.exists(path):
+        return finished
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by an interrupted run
+            if "error" not in entry:
+                finished[entry.get("id")] = entry.get("config_hash")
+    return finished
+
+def _batch_job(job):
+    """Optimize one batch entry in a worker process; returns its JSON Lines record"""
+    config_id, source, args = job
+    record = {"id": config_id}
+    try:
+        plot = load_source(source)
+        record["config_hash"] = config_hash(plot, args)
+        # the batch pool already uses every worker, so searches inside a plot stay in this process
+        record.update(optimize_plot(plot, args, max_workers=1))
+    except Exception as e:
+        record["error"] = str(e)
+    return record
+
+def run_batch(args):
+    """Optimize many plots with a bounded process pool, streaming one JSON line per finished plot.
+
+    With --out, results are appended to the file and plots that already have
+    a successful result for the same config and options are skipped, so an
+    interrupted sweep can simply be started again.
+    """
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+    try:
+        sources = batch_sources(args.source)
+    except Exception as e:
+        print(f"Error reading configs: {e}", file=sys.stderr)
+        return 1
+    finished = finished_configs(args.out)
+    jobs = []
+    for config_id, source in sources:
+        if config_id in finished:
+            try:
+                plot = load_source(source)
+                if finished[config_id] == config_hash(plot, args):
+                    continue
+            except Exception:
+                pass  # reported by the worker
+        jobs.append((config_id, source, args))
+    if args.debug:
+        print(f"batch: {len(jobs)} to optimize, {len(sources) - len(jobs)} already finished", file=sys.stderr)
+
+    try:
+        out = open(args.out, 'a', encoding='utf-8') if args.out else sys.stdout
+    except Exception as e:
+        print(f"Error opening output: {e}", file=sys.stderr)
+        return 1
+    workers = max(1, args.workers or os.cpu_count() or 1)
+    failed = 0
+    pending = set()
+    queued = iter(jobs)
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            # keep at most two jobs per worker in flight
+            for job in itertools.islice(queued, 2 * workers - len(pending)):
+                pending.add(pool.submit(_batch_job, job))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = future.result()
+                failed += "error" in record
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False, cancel_futures=True)
+        print("\nBatch interrupted; run it again with the same --out to resume", file=sys.stderr)
+        return 130
+    finally:
+        pool.shutdown(cancel_futures=True)
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failed else 0
+
+def add_search_arguments(parser):
+    """Search options shared by the optimize and batch commands"""
+    parser.add_argument('--mode', choices=['balanced', 'low_maintenance', 'max_harvest', 'max_quality'],
+                        help='Optimization mode (default: from the config)')
+    parser.add_argument('--engine', help='Search engine: hill_climb, simulated_annealing, tabu_search, genetic '
+                                         'or exact (branch and bound for plots up to 36 cells; default: from the config)')
+    parser.add_argument('--time', help='Wall-clock budget, e.g. 5s, 500ms, 2m (exact: default 10s)')
+    parser.add_argument('--target', type=float, help='Stop as soon as the score reaches this value')
+    parser.add_argument('--stagnation', help='Stop after this long without an improvement, e.g. 1s')
+    parser.add_argument('--iterations', type=int,
+                        help='Stop after this many candidate moves (default: 4000 when no other limit is given)')
+    parser.add_argument('--tiles', type=int, metavar='SIZE',
+                        help='Optimize large plots as tiles of at most SIZE x SIZE cells in parallel, '
+                             'then stitch the seams (e.g. 15 for 30x30 to 60x60 plots)')
+    parser.add_argument('--no-patterns', action='store_true',
+                        help='Start from a plain greedy fill instead of tiling patterns from patterns.json')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible results')
+    # also accepted before the command; SUPPRESS keeps "main.py --debug optimize" working
+    parser.add_argument('--debug', action='store_true', default=argparse.SUPPRESS,
+                        help='Print every improvement and the search statistics to stderr')
 
 def main():
     """Main entry point"""
@@ -18,6 +347,8 @@ def main():
 Examples:
   python main.py                 # Start the GUI application
   python main.py --help          # Show this help message
+  python main.py optimize --config plot.json --mode max_harvest --time 5s --out layout.json
+  python main.py batch plots/ --time 5s --workers 4 --out results.jsonl
   
 For more information, visit: https://github.com/KallosLaszlo/palia_garden
         """
@@ -35,14 +366,40 @@ For more information, visit: https://github.com/KallosLaszlo/palia_garden
         help='Enable debug mode'
     )
     
+    subparsers = parser.add_subparsers(dest='command')
+    optimize_parser = subparsers.add_parser(
+        'optimize',
+        help='Generate and optimize a layout without the GUI, printing JSON'
+    )
+    optimize_parser.add_argument('--config', required=True,
+                                 help='Plot definition (palia_config.json format: rows, cols, inventory, preferred_plant, optimization_mode)')
+    add_search_arguments(optimize_parser)
+    optimize_parser.add_argument('--out', help='Write the JSON result to this file instead of stdout')
+    batch_parser = subparsers.add_parser(
+        'batch',
+        help='Optimize many plot configs in parallel, printing one JSON line per finished plot'
+    )
+    batch_parser.add_argument('source',
+                              help="Directory of plot configs (*.json), or '-' to read JSON lines or config paths from stdin")
+    add_search_arguments(batch_parser)
+    batch_parser.add_argument('--workers', type=int, help='Plots optimized at the same time (default: CPU count)')
+    batch_parser.add_argument('--out', help='Append the results to this JSON Lines file and skip plots already in it')
+    
     args = parser.parse_args()
     
+    if args.command == 'optimize':
+        sys.exit(run_optimize(args))
+    if args.command == 'batch':
+        sys.exit(run_batch(args))
+    
     try:
-        # Create and run the application
+        # Create and run the application (imported here so headless runs never load Tkinter)
+        from palia_garden_optimizer import App
         app = App()
         
         if args.debug:
             print("Debug mode enabled")
+            app.debug = True
             app.title(app.title() + " (DEBUG)")
         
         # Start the main loop
@@ -56,4 +413,8 @@ For more information, visit: https://github.com/KallosLaszlo/palia_garden
         sys.exit(1)
 
 if __name__ == "__main__":
+    if getattr(sys, "frozen", False):
+        # Needed for worker processes of parallel restarts in the frozen executable
+        import multiprocessing
+        multiprocessing.freeze_support()
     main()
@@ -10,6 +10,9 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import sys
 import os
+import time
+import queue
+import threading
 
 # Resource path handling for PyInstaller
 def get_resource_path(relative_path):
@@ -25,16 +28,34 @@ def get_resource_path(relative_path):
 from config import save_config, load_config
 from crops import CROPS, COLOR
 from language import LANGUAGES, LanguageManager
-from garden import Garden, score_garden_optimized, greedy_fill_optimized, local_search_optimized
-from ui_utils import create_tooltip, load_crop_images
+from garden import (create_garden, garden_from_layout, score_garden_optimized,
+                    place_with_delta, remove_with_delta, optimize_anytime, describe_stats, SearchStats, SEARCH_ENGINES,
+                    SCORE_CACHE, solve_exact, EXACT_ENGINE)
+from parallel import parallel_restarts, tiled_optimize, TILED_MIN_CELLS
+from genetic import genetic_search, GENETIC_ENGINE
+from patterns import warm_start
+from topology import get_topology
+from ui_utils import create_tooltip, CropImageCache, GridGeometry
 
 
 class App(tk.Tk):
     """Main application class"""
     
+    # Wall-clock budget of the Optimize button in seconds (it runs in the background and can be cancelled)
+    OPTIMIZE_SECONDS = 5.0
+    # Optimize stops early after this many seconds without an improvement
+    OPTIMIZE_STAGNATION = 1.5
+    # Milliseconds between checks for results from the optimizer thread
+    POLL_INTERVAL_MS = 50
+    # Minimum seconds between layouts streamed back to the canvas
+    STREAM_INTERVAL = 0.1
+    
     def __init__(self):
         super().__init__()
         
+        # Set by main.py --debug: search statistics go to the status bar and console
+        self.debug = False
+        
         # Set window icon
         try:
             icon_path = get_resource_path("icon.ico")
@@ -59,11 +80,13 @@ class App(tk.Tk):
             var.trace_add("write", lambda *args: self.after_idle(self.save_current_config))
         self.preferred_var = tk.StringVar(value=self.config.get("preferred_plant", "Apple"))
         self.optimization_mode = tk.StringVar(value=self.config.get("optimization_mode", "balanced"))
+        self.search_engine = tk.StringVar(value=self.config.get("search_engine", "hill_climb"))
+        self.parallel_var = tk.BooleanVar(value=self.config.get("parallel_restarts", False))
         
-        # Load crop images
-        self.crop_images = load_crop_images()
+        # Crop images, decoded on first use from a disk thumbnail cache
+        self.crop_images = CropImageCache()
 
-        self.garden = Garden(self.rows_var.get(), self.cols_var.get())
+        self.garden = create_garden(self.rows_var.get(), self.cols_var.get())
         self._build_ui()
         self.update_language()
         self.redraw()
@@ -90,10 +113,12 @@ class App(tk.Tk):
         lang_code = next((code for code, name in self.lang_options if name == selected_display), "en")
         self.lang_manager.set_language(lang_code)
         self.update_language()
+        self.redraw()
         self.save_current_config()
     
     def on_closing(self):
         """Save config when closing the application"""
+        self.stop_optimization()
         self.save_current_config()
         self.destroy()
     
@@ -105,7 +130,9 @@ class App(tk.Tk):
             "cols": self.cols_var.get(),
             "inventory": {name: var.get() for name, var in self.inventory_vars.items()},
             "preferred_plant": self.preferred_var.get(),
-            "optimization_mode": self.optimization_mode.get()
+            "optimization_mode": self.optimization_mode.get(),
+            "search_engine": self.search_engine.get(),
+            "parallel_restarts": self.parallel_var.get()
         }
         save_config(config)
 
@@ -136,11 +163,28 @@ class App(tk.Tk):
         self.canvas.bind("<Button-1>", self.on_canvas_click)
         self.canvas.bind("<Motion>", self.on_canvas_hover)
         self.canvas.bind("<Leave>", self.on_canvas_leave)
+        self.canvas.bind("<Configure>", self.on_canvas_resize)
         
         # Track hover state
         self.hover_cell = None
         self.hover_overlays = []
         
+        # Canvas items per placement id, so changes only touch the affected plants
+        self.plant_items = {}  # pid -> ((name, r, c) as drawn, [canvas item ids])
+        self.grid_geom = None  # GridGeometry of the last full redraw
+        self.score_total = 0.0
+        self.score_key = None  # (preferred plant, mode) that score_total was computed for
+        
+        # Background optimization state and its progress bar (shown only while running)
+        self.opt_queue = None
+        self.opt_cancel = None
+        self.opt_context = None
+        self.progress_frame = ttk.Frame(self.right)
+        self.progress_bar = ttk.Progressbar(self.progress_frame, orient="horizontal", mode="determinate")
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+        self.cancel_btn = ttk.Button(self.progress_frame, text=self.get_text("cancel"), command=self.on_cancel_optimize)
+        self.cancel_btn.pack(side=tk.RIGHT)
+        
         # Build the control panel
         self.build_controls()
 
@@ -157,11 +201,8 @@ class App(tk.Tk):
         # Language selection
         ttk.Label(settings_box, text=self.get_text("language")).grid(row=0, column=0, sticky="w")
         
-        # Build language options dynamically from loaded languages
-        self.lang_options = []
-        for code, lang_data in LANGUAGES.items():
-            name = lang_data.get('language_name', code.upper())
-            self.lang_options.append((code, name))
+        # Build language options from the language index (files are loaded only when selected)
+        self.lang_options = list(LANGUAGES.display_names().items())
         
         # Sort by language name for better UX
         self.lang_options.sort(key=lambda x: x[1])
@@ -218,7 +259,30 @@ class App(tk.Tk):
         )
         
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+
+        # Thumbnails are decoded only once their row scrolls into view
+        pending_images = []  # (row frame, image label, crop name)
+        def load_visible_images():
+            top = canvas.canvasy(0)
+            bottom = top + canvas.winfo_height()
+            for row in list(pending_images):
+                row_frame, img_label, name = row
+                y = row_frame.winfo_y()
+                if y + row_frame.winfo_height() < top or y > bottom:
+                    continue
+                image = self.crop_images.get(name, 24)
+                if image is not None:
+                    img_label.configure(image=image)
+                else:
+                    # Placeholder if no image
+                    img_label.configure(image="", text="🌱", font=("Arial", 12))
+                pending_images.remove(row)
+
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            load_visible_images()
+
+        canvas.configure(yscrollcommand=on_scroll)
         
         # Mouse wheel scrolling
         def _on_mousewheel(event):
@@ -228,18 +292,15 @@ class App(tk.Tk):
         scrollable_frame.bind("<MouseWheel>", _on_mousewheel)
         
         # Add crops with images and spinboxes
+        self._blank_thumbnail = tk.PhotoImage(width=24, height=24)
         for i, name in enumerate(sorted(CROPS.keys())):
             row_frame = ttk.Frame(scrollable_frame)
             row_frame.pack(fill=tk.X, pady=1)
             
-            # Add image if available
-            if name in self.crop_images:
-                img_label = tk.Label(row_frame, image=self.crop_images[name])
-                img_label.pack(side=tk.LEFT, padx=(2, 5))
-            else:
-                # Placeholder if no image
-                placeholder = tk.Label(row_frame, text="🌱", font=("Arial", 12))
-                placeholder.pack(side=tk.LEFT, padx=(2, 5))
+            # Blank image of the thumbnail size until the row is shown
+            img_label = tk.Label(row_frame, image=self._blank_thumbnail)
+            img_label.pack(side=tk.LEFT, padx=(2, 5))
+            pending_images.append((row_frame, img_label, name))
             
             # Crop name - use localized name
             localized_name = self.get_crop_name(name)
@@ -296,6 +357,13 @@ class App(tk.Tk):
         ]
         for value, text in modes:
             ttk.Radiobutton(opt_box, text=text, variable=self.optimization_mode, value=value).pack(anchor="w")
+        
+        # Search engine used by the Optimize button
+        ttk.Separator(opt_box, orient="horizontal").pack(fill=tk.X, pady=4)
+        ttk.Label(opt_box, text=self.get_text("search_engine")).pack(anchor="w")
+        for value in [*SEARCH_ENGINES, GENETIC_ENGINE, EXACT_ENGINE]:
+            ttk.Radiobutton(opt_box, text=self.get_text(value), variable=self.search_engine, value=value).pack(anchor="w")
+        ttk.Checkbutton(opt_box, text=self.get_text("parallel_restarts"), variable=self.parallel_var).pack(anchor="w", pady=(4, 0))
 
     def _build_buttons_section(self):
         """Build the buttons section"""
@@ -354,6 +422,7 @@ class App(tk.Tk):
     def rebuild_ui(self):
         """Rebuild UI with current language"""
         self.build_controls()
+        self.cancel_btn.config(text=self.get_text("cancel"))
         self.status.config(text=f"{self.get_text('ready')} | {self.get_text('created_by')}")
         # Update language combobox display
         self.update_language_display()
@@ -364,8 +433,9 @@ class App(tk.Tk):
 
     def on_grid_change(self):
         """Handle grid size changes"""
+        self.stop_optimization()
         r = self.rows_var.get(); c = self.cols_var.get()
-        self.garden = Garden(r, c); self.redraw()
+        self.garden = create_garden(r, c); self.redraw()
         self.save_current_config()
 
     def on_add_all_seeds(self):
@@ -382,80 +452,224 @@ class App(tk.Tk):
 
     def on_generate(self):
         """Generate garden layout"""
+        self.stop_optimization()
         inv = {k: max(0, v.get()) for k, v in self.inventory_vars.items()}
         pref = self.preferred_var.get()
         opt_mode = self.optimization_mode.get()
+        if self.parallel_var.get():
+            # Best of several greedy fill + search pipelines, one per core, in the background
+            self.start_optimization(inventory=inv)
+            return
         self.garden.clear(); 
-        greedy_fill_optimized(self.garden, inv, pref, opt_mode)
+        stats = SearchStats()
+        # Library patterns tiled into the plot when they beat the greedy fill
+        copies = warm_start(self.garden, inv, pref, opt_mode, stats=stats)
         total, metrics = score_garden_optimized(self.garden, pref, opt_mode)
         self.status.config(text=f"{self.get_text('generated')} ({opt_mode}) - {self.get_text('score')}: {metrics['total_score']} | {self.get_text('created_by')}")
-        self.redraw()
+        self.refresh_canvas(total)
+        if self.debug:
+            print(f"Greedy fill: {stats.accepted} of {stats.tried} plants placed in {stats.elapsed:.3f}s, "
+                  f"{copies} pattern copies used")
 
     def on_optimize(self):
         """Optimize garden layout"""
+        if self.opt_queue is not None:
+            return
+        self.start_optimization()
+
+    def start_optimization(self, inventory=None):
+        """Run the selected search engine in a worker thread.
+
+        Improved layouts are streamed back through a queue that the Tk main
+        loop polls with after(), so the window never blocks. With an
+        inventory (parallel Generate) the garden is refilled first.
+        """
         pref = self.preferred_var.get()
         opt_mode = self.optimization_mode.get()
-        self.garden, best_score = local_search_optimized(self.garden, pref, opt_mode, iterations=4000)
-        self.status.config(text=f"{self.get_text('optimized')} ({opt_mode}) - {self.get_text('score')}: {round(best_score,3)} | {self.get_text('created_by')}")
-        self.redraw()
+        engine = self.search_engine.get()
+        parallel = self.parallel_var.get()
+        out_queue = queue.Queue()
+        cancel = threading.Event()
+        worker = threading.Thread(
+            target=self._optimize_worker,
+            args=(self.garden.clone(), pref, opt_mode, engine, parallel, inventory, cancel, out_queue),
+            daemon=True,
+        )
+        self.opt_queue = out_queue
+        self.opt_cancel = cancel
+        self.opt_context = (opt_mode, engine, inventory is not None)
+        
+        if parallel:
+            self.progress_bar.config(mode="indeterminate")
+            self.progress_bar.start(10)
+        else:
+            self.progress_bar.config(mode="determinate", maximum=self.OPTIMIZE_SECONDS, value=0)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.progress_frame.pack(side=tk.BOTTOM, fill=tk.X, before=self.canvas)
+        self.status.config(text=f"{self.get_text('optimizing')} ({opt_mode}, {self.get_text(engine)}) | {self.get_text('created_by')}")
+        worker.start()
+        self.after(self.POLL_INTERVAL_MS, self._poll_optimizer, out_queue)
+
+    def _optimize_worker(self, garden, pref, opt_mode, engine, parallel, inventory, cancel, out_queue):
+        """Worker thread body; talks to the UI only through out_queue"""
+        started = time.perf_counter()
+        # every run starts with an empty score cache, so it never outgrows one search
+        SCORE_CACHE.clear()
+        
+        def progress(stats):
+            # Runs in the worker thread between improvements
+            out_queue.put(("progress", stats["elapsed_seconds"], None, None))
+            return cancel.is_set()
+        
+        try:
+            if engine == EXACT_ENGINE:
+                # Branch and bound over the current plants (the inventory for a parallel Generate)
+                def exact_progress(nodes, layout, best_score):
+                    out_queue.put(("progress", time.perf_counter() - started, None, None))
+                    return cancel.is_set()
+                if inventory is not None:
+                    garden.clear()
+                best, best_score, certificate = solve_exact(garden, pref, opt_mode, inventory=inventory,
+                                                            time_limit=self.OPTIMIZE_SECONDS, progress=exact_progress)
+                if self.debug:
+                    print(f"Exact search: {certificate}")
+                out_queue.put(("done", time.perf_counter() - started, best.to_layout(), best_score, None))
+                return
+            if engine == GENETIC_ENGINE:
+                # Population search; the parallel option evaluates children on all cores
+                def genetic_progress(generation, best, best_score):
+                    out_queue.put(("progress", time.perf_counter() - started, best.to_layout(), best_score))
+                    return cancel.is_set()
+                best, best_score = genetic_search(garden, pref, opt_mode, inventory=inventory,
+                                                  time_budget=self.OPTIMIZE_SECONDS, progress=genetic_progress,
+                                                  max_workers=None if parallel else 1)
+                out_queue.put(("done", time.perf_counter() - started, best.to_layout(), best_score, None))
+                return
+            if parallel and garden.rows * garden.cols >= TILED_MIN_CELLS:
+                # Large plots: tiles on all cores, then the seams between them
+                best, best_score = tiled_optimize(garden, pref, opt_mode, inventory=inventory,
+                                                  engine=engine, time_budget=self.OPTIMIZE_SECONDS,
+                                                  progress=cancel.is_set)
+                out_queue.put(("done", time.perf_counter() - started, best.to_layout(), best_score, None))
+                return
+            if parallel:
+                best, best_score = parallel_restarts(garden, pref, opt_mode, inventory=inventory,
+                                                     engine=engine, time_budget=self.OPTIMIZE_SECONDS,
+                                                     progress=cancel.is_set)
+                out_queue.put(("done", time.perf_counter() - started, best.to_layout(), best_score, None))
+                return
+            last_sent = None
+            for layout, best_score, stats in optimize_anytime(garden, pref, opt_mode, engine,
+                                                              time_budget=self.OPTIMIZE_SECONDS,
+                                                              stagnation=self.OPTIMIZE_STAGNATION,
+                                                              progress=progress, cache=SCORE_CACHE):
+                elapsed = stats["elapsed_seconds"]
+                if stats["stop_reason"] is not None:
+                    out_queue.put(("done", elapsed, layout, best_score, stats))
+                elif last_sent is None or elapsed - last_sent >= self.STREAM_INTERVAL:
+                    # snapshot improvements, at most every STREAM_INTERVAL
+                    out_queue.put(("progress", elapsed, layout, best_score))
+                    last_sent = elapsed
+        except Exception as e:
+            out_queue.put(("error", str(e)))
+
+    def _poll_optimizer(self, out_queue):
+        """Apply results from the optimizer thread (runs on the Tk main loop)"""
+        if out_queue is not self.opt_queue:
+            return  # the run was abandoned
+        finished = None
+        latest_layout = None
+        latest_score = None
+        try:
+            while True:
+                msg = out_queue.get_nowait()
+                if msg[0] == "progress":
+                    _, elapsed, layout, best_score = msg
+                    self.progress_bar.config(value=elapsed)
+                    if layout is not None:
+                        latest_layout, latest_score = layout, best_score
+                else:
+                    finished = msg
+                    break
+        except queue.Empty:
+            pass
+        
+        if finished is None:
+            if latest_layout is not None:
+                self.garden = garden_from_layout(latest_layout)
+                self.refresh_canvas(latest_score)
+            self.after(self.POLL_INTERVAL_MS, self._poll_optimizer, out_queue)
+            return
+        
+        opt_mode, engine, generated = self.opt_context
+        self._end_optimization()
+        if finished[0] == "error":
+            messagebox.showerror(self.get_text("optimize"), finished[1])
+            return
+        _, elapsed, layout, best_score, stats = finished
+        self.garden = garden_from_layout(layout)
+        self.refresh_canvas(best_score)
+        label = self.get_text('generated') if generated else self.get_text('optimized')
+        text = f"{label} ({opt_mode}, {self.get_text(engine)}, {elapsed:.2f}s) - {self.get_text('score')}: {round(best_score,3)}"
+        if self.debug and stats is not None:
+            text += f" | {describe_stats(stats)} ({stats['stop_reason']})"
+            print(f"Search: {describe_stats(stats)}, stopped by {stats['stop_reason']}")
+        self.status.config(text=f"{text} | {self.get_text('created_by')}")
         self.save_current_config()
 
+    def _end_optimization(self):
+        """Hide the progress bar and forget the current run"""
+        self.opt_queue = None
+        self.opt_cancel = None
+        self.progress_bar.stop()
+        self.progress_frame.pack_forget()
+
+    def on_cancel_optimize(self):
+        """Stop the running search; the best layout found so far is kept"""
+        if self.opt_cancel is not None:
+            self.opt_cancel.set()
+            self.cancel_btn.config(state=tk.DISABLED)
+
+    def stop_optimization(self):
+        """Abandon a running search without applying its result"""
+        if self.opt_cancel is not None:
+            self.opt_cancel.set()
+            self._end_optimization()
+
     def on_clear(self):
         """Clear garden"""
-        self.garden.clear(); self.redraw()
+        self.stop_optimization()
+        self.garden.clear(); self.refresh_canvas(0.0)
 
     def cell_at_pixel(self, x, y):
         """Convert pixel coordinates to grid cell"""
-        W = self.canvas.winfo_width(); H = self.canvas.winfo_height()
-        pad = 10
-        
-        # Calculate same cell size as in redraw
-        available_w = W - 2*pad
-        available_h = H - 2*pad
-        max_cell_by_width = available_w // max(1, self.garden.cols)
-        max_cell_by_height = available_h // max(1, self.garden.rows)
-        cell_size = min(max_cell_by_width, max_cell_by_height, 120)
-        cell_size = max(cell_size, 30)
-        
-        # Apply same size adjustments as in redraw
-        total_cells = self.garden.rows * self.garden.cols
-        if total_cells <= 25:
-            cell_size = min(max_cell_by_width, max_cell_by_height, 150)
-        elif total_cells <= 64:
-            cell_size = min(max_cell_by_width, max_cell_by_height, 100)
-        
-        # Center the grid
-        total_w = cell_size * self.garden.cols
-        total_h = cell_size * self.garden.rows
-        start_x = (W - total_w) // 2
-        start_y = (H - total_h) // 2
-        
-        if x < start_x or y < start_y:
+        if self.grid_geom is None:
             return None
-        c = (x - start_x) // cell_size
-        r = (y - start_y) // cell_size
-        if r < 0 or r >= self.garden.rows or c < 0 or c >= self.garden.cols:
-            return None
-        return int(r), int(c)
+        return self.grid_geom.cell_at(x, y)
 
     def on_canvas_click(self, event):
         """Handle canvas click events"""
+        if self.opt_queue is not None: return  # layout is being optimized
         cell = self.cell_at_pixel(event.x, event.y)
         if cell is None: return
         r, c = cell
         pid = self.garden.grid[r][c]
+        pref = self.preferred_var.get(); opt_mode = self.optimization_mode.get()
         if pid is not None:
-            self.garden.remove(pid); self.redraw(); return
+            delta = remove_with_delta(self.garden, pid, pref, opt_mode)
+            self.refresh_canvas(self.score_total + delta); return
         name = self.preferred_var.get()
         if not self.garden.can_place(name, r, c):
             localized_name = self.get_crop_name(name)
             messagebox.showwarning(self.get_text("cannot_place"), 
                                  f"{localized_name} {self.get_text('collision_error')}")
             return
-        self.garden.place(name, r, c); self.redraw()
+        _, delta = place_with_delta(self.garden, name, r, c, pref, opt_mode)
+        self.refresh_canvas(self.score_total + delta)
 
     def on_canvas_hover(self, event):
         """Handle canvas hover events"""
+        # Motion fires for every pixel; only a change of cell needs any work
         cell = self.cell_at_pixel(event.x, event.y)
         if cell != self.hover_cell:
             self.hover_cell = cell
@@ -487,53 +701,21 @@ class App(tk.Tk):
         
         if effect is None:
             return
-            
-        # Calculate grid parameters (same as redraw)
-        W = self.canvas.winfo_width(); H = self.canvas.winfo_height()
-        pad = 10
-        available_w = W - 2*pad
-        available_h = H - 2*pad
-        max_cell_by_width = available_w // max(1, self.garden.cols)
-        max_cell_by_height = available_h // max(1, self.garden.rows)
-        cell_size = min(max_cell_by_width, max_cell_by_height, 120)
-        cell_size = max(cell_size, 30)
-        
-        total_cells = self.garden.rows * self.garden.cols
-        if total_cells <= 25:
-            cell_size = min(max_cell_by_width, max_cell_by_height, 150)
-        elif total_cells <= 64:
-            cell_size = min(max_cell_by_width, max_cell_by_height, 100)
-        
-        total_w = cell_size * self.garden.cols
-        total_h = cell_size * self.garden.rows
-        start_x = (W - total_w) // 2
-        start_y = (H - total_h) // 2
+        geom = self.grid_geom
         
         # Highlight the plant itself with a thick border
-        x0 = start_x + plant_meta["c"] * cell_size
-        y0 = start_y + plant_meta["r"] * cell_size
-        x1 = start_x + (plant_meta["c"] + plant_meta["w"]) * cell_size - 2
-        y1 = start_y + (plant_meta["r"] + plant_meta["h"]) * cell_size - 2
+        x0, y0, x1, y1 = geom.plant_rect(plant_meta["r"], plant_meta["c"], plant_meta["w"], plant_meta["h"])
         
         highlight_id = self.canvas.create_rectangle(x0, y0, x1, y1, outline="#FFD700", width=4, fill="")
         self.hover_overlays.append(highlight_id)
         
         # Show affected neighboring cells
-        from garden import ortho_neighbors
-        affected_cells = set()
-        for pr in range(plant_meta["r"], plant_meta["r"] + plant_meta["h"]):
-            for pc in range(plant_meta["c"], plant_meta["c"] + plant_meta["w"]):
-                for nr, nc in ortho_neighbors(pr, pc, self.garden.rows, self.garden.cols):
-                    n_pid = self.garden.grid[nr][nc]
-                    if n_pid != pid:  # Don't highlight the plant itself
-                        affected_cells.add((nr, nc))
+        topo = get_topology(self.garden.rows, self.garden.cols)
+        affected_cells = topo.perimeter(plant_meta["w"], plant_meta["h"])[plant_meta["r"]][plant_meta["c"]]
         
         # Draw overlay on affected cells
         for ar, ac in affected_cells:
-            ax0 = start_x + ac * cell_size
-            ay0 = start_y + ar * cell_size
-            ax1 = ax0 + cell_size - 1
-            ay1 = ay0 + cell_size - 1
+            ax0, ay0, ax1, ay1 = geom.cell_rects[ar][ac]
             
             # Different colors for boost vs debuff
             n_pid = self.garden.grid[ar][ac]
@@ -584,83 +766,113 @@ class App(tk.Tk):
         self.hover_overlays.append(text_id)
 
     def redraw(self):
-        """Redraw the garden canvas"""
+        """Rebuild the whole garden canvas (grid size, resize and language changes)"""
         self.canvas.delete("all")
-        W = self.canvas.winfo_width(); H = self.canvas.winfo_height()
-        pad = 10
-        if self.garden.cols == 0 or self.garden.rows == 0: return
-        
-        # Calculate square cell size (1:1 aspect ratio) - optimized for better space usage
-        available_w = W - 2*pad
-        available_h = H - 2*pad
-        
-        # Try to use more space by increasing maximum cell size
-        max_cell_by_width = available_w // max(1, self.garden.cols)
-        max_cell_by_height = available_h // max(1, self.garden.rows)
-        cell_size = min(max_cell_by_width, max_cell_by_height, 120)
-        cell_size = max(cell_size, 30)
-        
-        # If grid is very small, allow larger cells
-        total_cells = self.garden.rows * self.garden.cols
-        if total_cells <= 25:  # 5x5 or smaller
-            cell_size = min(max_cell_by_width, max_cell_by_height, 150)
-        elif total_cells <= 64:  # 8x8 or smaller  
-            cell_size = min(max_cell_by_width, max_cell_by_height, 100)
-        
-        # Center the grid
-        total_w = cell_size * self.garden.cols
-        total_h = cell_size * self.garden.rows
-        start_x = (W - total_w) // 2
-        start_y = (H - total_h) // 2
+        self.plant_items = {}
+        self.hover_overlays = []
+        self.hover_cell = None
+        if self.garden.cols == 0 or self.garden.rows == 0:
+            self.grid_geom = None
+            return
+        geom = GridGeometry(self.canvas.winfo_width(), self.canvas.winfo_height(), self.garden.rows, self.garden.cols)
+        self.grid_geom = geom
         
         # Draw grid
-        for r in range(self.garden.rows):
-            for c in range(self.garden.cols):
-                x0 = start_x + c * cell_size; y0 = start_y + r * cell_size
-                x1 = x0 + cell_size - 1; y1 = y0 + cell_size - 1
+        for row in geom.cell_rects:
+            for x0, y0, x1, y1 in row:
                 self.canvas.create_rectangle(x0, y0, x1, y1, outline="#444", width=1)
         
         # Draw plants
-        for pid, meta in self.garden.placements.items():
-            x0 = start_x + meta["c"] * cell_size; y0 = start_y + meta["r"] * cell_size
-            x1 = start_x + (meta["c"] + meta["w"]) * cell_size - 2; y1 = start_y + (meta["r"] + meta["h"]) * cell_size - 2
-            name = meta["name"]; color = COLOR.get(name, "#95a5a6")
-            localized_name = self.get_crop_name(name)
-            self.canvas.create_rectangle(x0, y0, x1, y1, fill=color, outline="#111", width=2)
-            
-            # Add image if available and cell is large enough
-            center_x, center_y = (x0+x1)//2, (y0+y1)//2
-            if name in self.crop_images and cell_size >= 40:
-                # Show image in the center-top
-                img_y = y0 + cell_size//3
-                self.canvas.create_image(center_x, img_y, image=self.crop_images[name])
-                # Text below image
-                text_y = y0 + cell_size - 10
-                font_size = max(8, min(16, cell_size//7))
-                self.canvas.create_text(center_x, text_y, text=localized_name[:10], fill="#fff", font=("Arial", font_size, "bold"))
-            else:
-                # Just text, adjust font size based on cell size
-                font_size = max(7, min(18, cell_size//4))
-                # Split long names into two lines for better readability
-                if len(localized_name) > 8 and cell_size >= 50:
-                    words = localized_name.split()
-                    if len(words) > 1:
-                        line1 = words[0]
-                        line2 = " ".join(words[1:])[:10]
-                        self.canvas.create_text(center_x, center_y - font_size//2, text=line1, fill="#fff", font=("Arial", font_size))
-                        self.canvas.create_text(center_x, center_y + font_size//2, text=line2, fill="#fff", font=("Arial", font_size))
-                    else:
-                        self.canvas.create_text(center_x, center_y, text=localized_name[:12], fill="#fff", font=("Arial", font_size))
+        for pid in self.garden.placements:
+            self._draw_plant(pid)
+        self.update_score()
+
+    def refresh_canvas(self, total=None):
+        """Bring the canvas in line with self.garden, redrawing only plants that changed.
+
+        total is the new score when the caller already knows it; otherwise the
+        garden is re-scored.
+        """
+        geom = self.grid_geom
+        if geom is None or (geom.rows, geom.cols) != (self.garden.rows, self.garden.cols):
+            self.redraw()
+            return
+        placements = self.garden.placements
+        for pid in list(self.plant_items):
+            meta = placements.get(pid)
+            if meta is None or (meta["name"], meta["r"], meta["c"]) != self.plant_items[pid][0]:
+                self._erase_plant(pid)
+        for pid in placements:
+            if pid not in self.plant_items:
+                self._draw_plant(pid)
+        # keep hover overlays above plants that were just drawn
+        cell = self.hover_cell
+        self.clear_hover_overlays()
+        if cell is not None:
+            self.show_hover_effects(cell)
+        self.update_score(total)
+
+    def _erase_plant(self, pid):
+        """Delete the canvas items of one placement"""
+        _, items = self.plant_items.pop(pid)
+        for item in items:
+            self.canvas.delete(item)
+
+    def _draw_plant(self, pid):
+        """Create the canvas items of one placement and remember them under its pid"""
+        cell_size = self.grid_geom.cell_size
+        meta = self.garden.placements[pid]
+        items = []
+        x0, y0, x1, y1 = self.grid_geom.plant_rect(meta["r"], meta["c"], meta["w"], meta["h"])
+        name = meta["name"]; color = COLOR.get(name, "#95a5a6")
+        localized_name = self.get_crop_name(name)
+        items.append(self.canvas.create_rectangle(x0, y0, x1, y1, fill=color, outline="#111", width=2))
+        
+        # Add image if available and cell is large enough
+        center_x, center_y = (x0+x1)//2, (y0+y1)//2
+        image = self.crop_images.get(name, cell_size//2) if cell_size >= 40 else None
+        if image is not None:
+            # Show image in the center-top, in the thumbnail size that suits the cell
+            img_y = y0 + cell_size//3
+            items.append(self.canvas.create_image(center_x, img_y, image=image))
+            # Text below image
+            text_y = y0 + cell_size - 10
+            font_size = max(8, min(16, cell_size//7))
+            items.append(self.canvas.create_text(center_x, text_y, text=localized_name[:10], fill="#fff", font=("Arial", font_size, "bold")))
+        else:
+            # Just text, adjust font size based on cell size
+            font_size = max(7, min(18, cell_size//4))
+            # Split long names into two lines for better readability
+            if len(localized_name) > 8 and cell_size >= 50:
+                words = localized_name.split()
+                if len(words) > 1:
+                    line1 = words[0]
+                    line2 = " ".join(words[1:])[:10]
+                    items.append(self.canvas.create_text(center_x, center_y - font_size//2, text=line1, fill="#fff", font=("Arial", font_size)))
+                    items.append(self.canvas.create_text(center_x, center_y + font_size//2, text=line2, fill="#fff", font=("Arial", font_size)))
                 else:
-                    self.canvas.create_text(center_x, center_y, text=localized_name[:10], fill="#fff", font=("Arial", font_size))
-        
-        # Update status
+                    items.append(self.canvas.create_text(center_x, center_y, text=localized_name[:12], fill="#fff", font=("Arial", font_size)))
+            else:
+                items.append(self.canvas.create_text(center_x, center_y, text=localized_name[:10], fill="#fff", font=("Arial", font_size)))
+        self.plant_items[pid] = ((name, meta["r"], meta["c"]), items)
+
+    def update_score(self, total=None):
+        """Show the score in the status bar; re-scores the garden unless total is given"""
         pref = self.preferred_var.get()
         opt_mode = self.optimization_mode.get()
-        total, metrics = score_garden_optimized(self.garden, pref, opt_mode)
-        stat_text = f"{self.get_text('score')}: {metrics['total_score']} | {opt_mode} | {self.get_text('created_by')}"
+        if total is None or self.score_key != (pref, opt_mode):
+            total, _ = score_garden_optimized(self.garden, pref, opt_mode)
+        self.score_total = total
+        self.score_key = (pref, opt_mode)
+        stat_text = f"{self.get_text('score')}: {round(total, 3)} | {opt_mode} | {self.get_text('created_by')}"
         self.status.config(text=stat_text)
 
+    def on_canvas_resize(self, event):
+        """Rebuild the canvas when its size changes"""
+        geom = self.grid_geom
+        if geom is None or not geom.matches(event.width, event.height, self.garden.rows, self.garden.cols):
+            self.redraw()
+
 
 def main():
     """Main entry point"""
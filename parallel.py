@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Multi-core restarts and tiled optimization for Palia Garden Optimizer
+"""
+
+import os
+import time
+import random
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from crops import CROPS
+from garden import (create_garden, garden_from_layout, greedy_fill_optimized, local_search_optimized,
+                    score_garden_optimized, optimize_anytime, SEARCH_ENGINES, SCORE_CACHE, SCORE_EPS)
+from patterns import warm_start
+
+# Tiles of tiled_optimize are at most this many cells high and wide
+TILE_SIZE = 15
+# Plants within this many cells of a tile boundary are moved by the stitching pass, at most this far
+SEAM_WIDTH = 4
+# The GUI optimizes grids of at least this many cells in tiles
+TILED_MIN_CELLS = 900
+# Share of a time budget spent on the tiles; the rest stitches the seams
+TILE_TIME_SHARE = 0.6
+# Stitching moves per seam plant when there is no time budget
+STITCH_ITERATIONS_PER_PLANT = 50
+# Seconds between cancel checks while worker processes run
+CANCEL_POLL_SECONDS = 0.1
+
+# multiprocessing.Event shared with the worker processes, set to stop their searches
+_cancel_event = None
+
+def _init_worker(event):
+    """Worker process initializer: remember the shared cancel event"""
+    global _cancel_event
+    _cancel_event = event
+
+def _cancelled():
+    """True once the parent process cancelled the run"""
+    return _cancel_event is not None and _cancel_event.is_set()
+
+def _run_pipeline(job, stop=None):
+    """Run one seeded warm start + search pipeline; returns (score, layout).
+
+    With an inventory the garden is filled by warm_start (library patterns or
+    greedy fill, whichever scores higher), or by a plain greedy fill when
+    patterns is False. stop() is polled during the search (the shared cancel
+    event by default); returning True ends it with the best layout so far.
+    """
+    stop = stop or _cancelled
+    layout, inventory, preferred_name, optimization_mode, engine, iterations, time_budget, seed, patterns = job
+    rng = random.Random(seed)
+    garden = garden_from_layout(layout)
+    if inventory is not None:
+        garden.clear()
+        if patterns:
+            warm_start(garden, inventory, preferred_name, optimization_mode, rng=rng)
+        else:
+            greedy_fill_optimized(garden, inventory, preferred_name, optimization_mode, rng=rng)
+    if time_budget is not None:
+        for best_layout, best_score, _ in optimize_anytime(garden, preferred_name, optimization_mode, engine,
+                                                           time_budget=time_budget, rng=rng,
+                                                           progress=lambda stats: stop(), cache=SCORE_CACHE):
+            pass
+        return best_score, best_layout
+    search = SEARCH_ENGINES[engine]
+    best, best_score = search(garden, preferred_name, optimization_mode, iterations=iterations, rng=rng,
+                              progress=lambda done, best, score: stop(), cache=SCORE_CACHE)
+    return best_score, best.to_layout()
+
+def _run_pipelines(jobs, max_workers, progress=None):
+    """Results of _run_pipeline for every job, in order, on up to max_workers processes.
+
+    progress() is polled between checks (every CANCEL_POLL_SECONDS); once it
+    returns True the running and waiting pipelines stop early and return
+    their best layouts so far.
+    """
+    if max_workers <= 1:
+        return [_run_pipeline(job, progress) for job in jobs]
+    event = multiprocessing.Event()
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(event,)) as pool:
+        futures = [pool.submit(_run_pipeline, job) for job in jobs]
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=CANCEL_POLL_SECONDS)
+            if pending and progress is not None and not event.is_set() and progress():
+                event.set()
+        return [future.result() for future in futures]
+
+def parallel_restarts(garden, preferred_name, optimization_mode="balanced", inventory=None,
+                      engine="hill_climb", iterations=4000, restarts=None, seed=None, max_workers=None,
+                      time_budget=None, progress=None, patterns=True):
+    """Run independent seeded pipelines on all cores and keep the best layout.
+
+    With an inventory every pipeline starts from an empty garden of the same
+    size and fills it with warm_start (a plain greedy fill when patterns is
+    False) before searching; without one every pipeline searches from the
+    garden's current layout. Each pipeline has its own random.Random seeded
+    from seed + index, so runs are reproducible. With time_budget (seconds)
+    each pipeline searches for that long with optimize_anytime instead of a
+    fixed number of iterations. Layouts travel between processes as
+    Garden.to_layout() dicts; every worker process searches with its own
+    SCORE_CACHE. progress() is polled while the pipelines run; returning True
+    cancels them and keeps the best layout found so far. Returns (best
+    garden, best score); the input garden is not modified.
+    """
+    cpus = os.cpu_count() or 1
+    restarts = restarts or cpus
+    max_workers = min(max_workers or cpus, restarts)
+    if seed is None:
+        seed = random.randrange(2**32)
+    layout = garden.to_layout()
+    jobs = [(layout, inventory, preferred_name, optimization_mode, engine, iterations, time_budget, seed + i, patterns)
+            for i in range(restarts)]
+    results = _run_pipelines(jobs, max_workers, progress)
+    best_score, best_layout = max(results, key=lambda result: result[0])
+    best = create_garden(garden.rows, garden.cols)
+    best.load_layout(best_layout)
+    best_score, _ = score_garden_optimized(best, preferred_name, optimization_mode)
+    return best, best_score
+
+def _tile_bounds(size, tile_size):
+    """Boundaries splitting size cells into the fewest near-equal parts of at most tile_size"""
+    count = max(1, -(-size // tile_size))
+    return [round(i * size / count) for i in range(count + 1)]
+
+def split_tiles(rows, cols, tile_size=TILE_SIZE):
+    """(r0, r1, c0, c1) of the tiles covering the grid, row by row"""
+    row_bounds = _tile_bounds(rows, tile_size)
+    col_bounds = _tile_bounds(cols, tile_size)
+    return [(row_bounds[i], row_bounds[i + 1], col_bounds[j], col_bounds[j + 1])
+            for i in range(len(row_bounds) - 1) for j in range(len(col_bounds) - 1)]
+
+def distribute_inventory(inventory, tiles):
+    """Split the inventory over the tiles in proportion to their area.
+
+    Plants go largest first to the fitting tile with the smallest planted
+    share, so every tile gets a similar mix of crops. Plants larger than
+    every tile are left out. Returns one inventory dict per tile.
+    """
+    shares = [Counter() for _ in tiles]
+    planted = [0] * len(tiles)
+    areas = [(r1 - r0) * (c1 - c0) for r0, r1, c0, c1 in tiles]
+    for name in sorted(inventory, key=lambda name: (-CROPS[name]["size"][0] * CROPS[name]["size"][1], name)):
+        w, h = CROPS[name]["size"]
+        fitting = [i for i, (r0, r1, c0, c1) in enumerate(tiles) if r1 - r0 >= h and c1 - c0 >= w]
+        if not fitting:
+            continue
+        for _ in range(inventory[name]):
+            i = min(fitting, key=lambda i: planted[i] / areas[i])
+            shares[i][name] += 1
+            planted[i] += w * h
+    return [dict(share) for share in shares]
+
+def tile_layouts(garden, tiles):
+    """Split a garden's plants by tile; returns (one layout per tile, plants crossing a tile border).
+
+    Tile layouts are in tile coordinates, crossing plants are [name, r, c]
+    in garden coordinates.
+    """
+    layouts = [{"rows": r1 - r0, "cols": c1 - c0, "plants": []} for r0, r1, c0, c1 in tiles]
+    crossing = []
+    for meta in garden.placements.values():
+        for layout, (r0, r1, c0, c1) in zip(layouts, tiles):
+            if r0 <= meta["r"] and meta["r"] + meta["h"] <= r1 and c0 <= meta["c"] and meta["c"] + meta["w"] <= c1:
+                layout["plants"].append([meta["name"], meta["r"] - r0, meta["c"] - c0])
+                break
+        else:
+            crossing.append([meta["name"], meta["r"], meta["c"]])
+    return layouts, crossing
+
+def seam_plants(garden, tiles, seam_width=SEAM_WIDTH):
+    """Placement ids of the plants within seam_width cells of an inner tile boundary"""
+    row_seams = sorted({r0 for r0, _, _, _ in tiles if r0 > 0})
+    col_seams = sorted({c0 for _, _, c0, _ in tiles if c0 > 0})
+    return [pid for pid, meta in garden.placements.items()
+            if any(meta["r"] - seam_width < b < meta["r"] + meta["h"] + seam_width for b in row_seams)
+            or any(meta["c"] - seam_width < b < meta["c"] + meta["w"] + seam_width for b in col_seams)]
+
+def tiled_optimize(garden, preferred_name, optimization_mode="balanced", inventory=None, engine="hill_climb",
+                   tile_size=TILE_SIZE, seam_width=SEAM_WIDTH, iterations=4000, time_budget=None, seed=None,
+                   max_workers=None, progress=None, patterns=True):
+    """Optimize a large grid as independent tiles, then stitch the seams.
+
+    The grid is split into tiles of at most tile_size cells per side and the
+    inventory is shared out by tile area; every tile is filled with
+    warm_start (greedy fill when patterns is False) and searched on its own,
+    in parallel processes, like a parallel_restarts pipeline. With inventory
+    None every tile is searched from the garden's plants inside it instead,
+    plants crossing a tile border stay where they are, and the garden itself
+    is returned if the result scores lower. The tiles are joined, plants that
+    did not fit are placed by greedy fill, and a hill climb that moves only
+    plants near the tile boundaries, by at most seam_width cells, repairs the
+    seams; its windows overlap both neighbouring tiles. With time_budget,
+    TILE_TIME_SHARE of it goes to the tiles. progress() is polled throughout;
+    returning True cancels the tile searches and the stitching, keeping what
+    they found so far. Returns (best garden, best score) with the score from
+    the full scorer; the input garden is not modified.
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    tiles = split_tiles(garden.rows, garden.cols, tile_size)
+    keep_input = inventory is None
+    if keep_input:
+        inventory = dict(Counter(meta["name"] for meta in garden.placements.values()))
+        layouts, crossing = tile_layouts(garden, tiles)
+        shares = [None] * len(tiles)
+    else:
+        layouts = [{"rows": r1 - r0, "cols": c1 - c0, "plants": []} for r0, r1, c0, c1 in tiles]
+        crossing = []
+        shares = distribute_inventory(inventory, tiles)
+    cpus = os.cpu_count() or 1
+    max_workers = min(max_workers or cpus, len(tiles))
+    tile_budget = None
+    if time_budget is not None:
+        waves = -(-len(tiles) // max_workers)
+        tile_budget = time_budget * TILE_TIME_SHARE / waves
+    jobs = [(layout, share, preferred_name, optimization_mode, engine, iterations, tile_budget, rng.randrange(2**32),
+             patterns) for layout, share in zip(layouts, shares)]
+    results = _run_pipelines(jobs, max_workers, progress)
+    stop = progress or (lambda: False)
+
+    joined = create_garden(garden.rows, garden.cols)
+    left = Counter(inventory)
+    for name, r, c in crossing:
+        joined.place(name, r, c)
+        left[name] -= 1
+    for (r0, _, c0, _), (_, layout) in zip(tiles, results):
+        for name, r, c in layout["plants"]:
+            if left[name] > 0 and joined.place(name, r0 + r, c0 + c) is not None:
+                left[name] -= 1
+    greedy_fill_optimized(joined, +left, preferred_name, optimization_mode, rng=rng)
+
+    movable = seam_plants(joined, tiles, seam_width)
+    if time_budget is not None:
+        deadline = started + time_budget
+        best, _ = local_search_optimized(joined, preferred_name, optimization_mode, iterations=None, rng=rng,
+                                         progress=lambda done, best, score: time.perf_counter() >= deadline or stop(),
+                                         cache=SCORE_CACHE, movable=movable, radius=seam_width)
+    else:
+        best, _ = local_search_optimized(joined, preferred_name, optimization_mode,
+                                         iterations=STITCH_ITERATIONS_PER_PLANT * len(movable), rng=rng,
+                                         progress=lambda done, best, score: stop(),
+                                         cache=SCORE_CACHE, movable=movable, radius=seam_width)
+    best_score, _ = score_garden_optimized(best, preferred_name, optimization_mode, cache=None)
+    if keep_input:
+        start_score, _ = score_garden_optimized(garden, preferred_name, optimization_mode, cache=None)
+        if start_score > best_score + SCORE_EPS:
+            return garden.clone(), start_score
+    return best, best_score
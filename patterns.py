@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pattern library of precomputed tiles for Palia Garden Optimizer
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import itertools
+from collections import Counter
+
+from crops import CROPS
+from garden import create_garden, greedy_fill_optimized, score_garden_optimized, MODE_WEIGHTS, SCORE_EPS
+
+PATTERNS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "patterns.json")
+# A tile is scored as a block of PERIOD_REPEATS x PERIOD_REPEATS copies, so its edges meet repeated neighbours
+PERIOD_REPEATS = 3
+BUILD_ITERATIONS = 600
+BUILD_RESTARTS = 2
+# Bundled library: every pair of 1x1 crops with different effects as a 2x2 tile (2 + 2) and every
+# triple as a 3x3 tile (3 + 3 + 3)
+DEFAULT_TILES = ((2, 2, 2), (3, 3, 3))  # (rows, cols, crops per tile)
+
+def pattern_key(rows, cols, crops, optimization_mode):
+    """Library key of a tile shape, crop multiset and mode, e.g. '2x2|balanced|Corn:2,Potato:2'"""
+    multiset = ",".join(f"{name}:{cnt}" for name, cnt in sorted(crops.items()) if cnt > 0)
+    return f"{rows}x{cols}|{optimization_mode}|{multiset}"
+
+def tile_score(layout, optimization_mode, repeats=PERIOD_REPEATS):
+    """Score per copy of a tile layout repeated repeats x repeats times (preferred plant bonus excluded)"""
+    rows, cols = layout["rows"], layout["cols"]
+    block = create_garden(rows * repeats, cols * repeats)
+    for i in range(repeats):
+        for j in range(repeats):
+            for name, r, c in layout["plants"]:
+                block.place(name, i * rows + r, j * cols + c)
+    total, _ = score_garden_optimized(block, None, optimization_mode, cache=None)
+    return total / (repeats * repeats)
+
+def _fits(rows, cols, plants):
+    """True if the plants fit a rows x cols tile without overlapping"""
+    tile = create_garden(rows, cols)
+    return all(tile.place(name, r, c) is not None for name, r, c in plants)
+
+def build_pattern(rows, cols, crops, optimization_mode="balanced", iterations=BUILD_ITERATIONS,
+                  restarts=BUILD_RESTARTS, seed=None):
+    """Search a high-scoring rows x cols tile holding exactly the crops multiset.
+
+    Every restart greedy fills the tile and then accepts swaps of two
+    different crops of the same size, or relocations, that do not lower
+    tile_score. Returns (layout, score per copy); raises ValueError when
+    the crops do not fit the tile.
+    """
+    rng = random.Random(seed)
+    best_layout, best_score = None, None
+    for _ in range(restarts):
+        tile = create_garden(rows, cols)
+        greedy_fill_optimized(tile, crops, None, optimization_mode, rng=rng)
+        if len(tile.placements) < sum(crops.values()):
+            raise ValueError(f"{pattern_key(rows, cols, crops, optimization_mode)} does not fit its tile")
+        plants = tile.to_layout()["plants"]
+        score = tile_score(tile.to_layout(), optimization_mode)
+        for _ in range(iterations):
+            candidate = [plant[:] for plant in plants]
+            i = rng.randrange(len(candidate))
+            j = rng.randrange(len(candidate))
+            if candidate[i][0] != candidate[j][0] and CROPS[candidate[i][0]]["size"] == CROPS[candidate[j][0]]["size"]:
+                candidate[i][0], candidate[j][0] = candidate[j][0], candidate[i][0]
+            else:
+                w, h = CROPS[candidate[i][0]]["size"]
+                candidate[i][1:] = [rng.randrange(rows - h + 1), rng.randrange(cols - w + 1)]
+                if not _fits(rows, cols, candidate):
+                    continue
+            candidate_score = tile_score({"rows": rows, "cols": cols, "plants": candidate}, optimization_mode)
+            if candidate_score >= score - SCORE_EPS:
+                plants, score = candidate, candidate_score
+        if best_score is None or score > best_score + SCORE_EPS:
+            best_layout, best_score = {"rows": rows, "cols": cols, "plants": plants}, score
+    return best_layout, best_score
+
+class PatternLibrary:
+    """High-scoring tile layouts keyed by (tile shape, crop multiset, mode), stored as JSON.
+
+    The file is read on first use; a missing or broken file is an empty library.
+    """
+
+    def __init__(self, path=PATTERNS_FILE):
+        self.path = path
+        self._patterns = None  # key -> {"layout", "crops", "mode", "score"}
+
+    @property
+    def patterns(self):
+        if self._patterns is None:
+            self._patterns = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        self._patterns = json.load(f).get("patterns", {})
+                except Exception as e:
+                    print(f"Error loading pattern library {self.path}: {e}")
+        return self._patterns
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def get(self, rows, cols, crops, optimization_mode):
+        """Stored entry for a tile shape, crop multiset and mode, or None"""
+        return self.patterns.get(pattern_key(rows, cols, crops, optimization_mode))
+
+    def put(self, layout, crops, optimization_mode, score):
+        """Store a tile layout unless the library has a better one; returns True if stored"""
+        key = pattern_key(layout["rows"], layout["cols"], crops, optimization_mode)
+        old = self.patterns.get(key)
+        if old is not None and old["score"] >= score - SCORE_EPS:
+            return False
+        self.patterns[key] = {"layout": layout, "crops": dict(crops), "mode": optimization_mode,
+                              "score": round(score, 6)}
+        return True
+
+    def candidates(self, optimization_mode):
+        """Entries stored for a mode"""
+        return [entry for entry in self.patterns.values() if entry["mode"] == optimization_mode]
+
+    def save(self):
+        """Write the library back to its file"""
+        # one pattern per line keeps the bundled file small and diffs readable
+        lines = [f"  {json.dumps(key)}: {json.dumps(entry)}" for key, entry in sorted(self.patterns.items())]
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('{"version": 1, "patterns": {\n' + ",\n".join(lines) + "\n}}\n")
+
+PATTERNS = PatternLibrary()
+
+def _free_slots(garden, layout):
+    """Anchors on the tile's own grid where every plant of the tile can be placed"""
+    rows, cols = layout["rows"], layout["cols"]
+    return [(r0, c0)
+            for r0 in range(0, garden.rows - rows + 1, rows)
+            for c0 in range(0, garden.cols - cols + 1, cols)
+            if all(garden.can_place(name, r0 + r, c0 + c) for name, r, c in layout["plants"])]
+
+def pattern_fill(garden, inventory, preferred_name, optimization_mode="balanced", library=None, rng=None):
+    """Tile library patterns into the garden, then greedy fill what is left of the inventory.
+
+    The pattern worth the most (score per copy times copies that the
+    inventory and the free tile slots allow) is tiled first, then the next
+    one on what remains. Returns the number of pattern copies placed.
+    """
+    library = library if library is not None else PATTERNS
+    left = Counter({name: cnt for name, cnt in inventory.items() if cnt > 0})
+    placed = 0
+    while True:
+        best = None
+        for entry in library.candidates(optimization_mode):
+            crops = entry["crops"]
+            copies = min(left[name] // cnt for name, cnt in crops.items())
+            if copies <= 0 or (best is not None and copies * entry["score"] <= best[0]):
+                continue
+            slots = _free_slots(garden, entry["layout"])[:copies]
+            if slots and (best is None or len(slots) * entry["score"] > best[0]):
+                best = (len(slots) * entry["score"], entry, slots)
+        if best is None:
+            break
+        _, entry, slots = best
+        for r0, c0 in slots:
+            for name, r, c in entry["layout"]["plants"]:
+                garden.place(name, r0 + r, c0 + c)
+        for name, cnt in entry["crops"].items():
+            left[name] -= cnt * len(slots)
+        placed += len(slots)
+    greedy_fill_optimized(garden, +left, preferred_name, optimization_mode, rng=rng)
+    return placed
+
+def warm_start(garden, inventory, preferred_name, optimization_mode="balanced", library=None, rng=None, stats=None):
+    """Fill an empty garden with the better of a pattern tiling and a plain greedy fill.
+
+    stats is passed to the greedy fill. Returns the number of pattern copies
+    in the result (0 when the greedy fill was kept).
+    """
+    tiled = garden.clone()
+    copies = pattern_fill(tiled, inventory, preferred_name, optimization_mode, library=library, rng=rng)
+    greedy_fill_optimized(garden, inventory, preferred_name, optimization_mode, rng=rng, stats=stats)
+    if copies and score_garden_optimized(tiled, preferred_name, optimization_mode)[0] > \
+            score_garden_optimized(garden, preferred_name, optimization_mode)[0] + SCORE_EPS:
+        garden.load_layout(tiled.to_layout())
+        return copies
+    return 0
+
+def default_tiles():
+    """(rows, cols, crops) of the bundled library"""
+    groups = {}
+    for name, meta in CROPS.items():
+        if meta["size"] == (1, 1):
+            groups.setdefault(meta["effect"], []).append(name)
+    for rows, cols, kinds in DEFAULT_TILES:
+        per_crop = rows * cols // kinds
+        for effects in itertools.combinations(sorted(groups, key=str), kinds):
+            for names in itertools.product(*(groups[effect] for effect in effects)):
+                yield rows, cols, {name: per_crop for name in names}
+
+def config_tile(path, rows, cols):
+    """Crop multiset of a plot config's 1x1 inventory scaled to a rows x cols tile"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        inventory = {name: cnt for name, cnt in json.load(f).get("inventory", {}).items()
+                     if cnt > 0 and CROPS.get(name, {}).get("size") == (1, 1)}
+    total = sum(inventory.values())
+    if not total:
+        raise ValueError(f"{path} has no 1x1 crops")
+    area = rows * cols
+    shares = {name: cnt * area / total for name, cnt in inventory.items()}
+    crops = {name: int(share) for name, share in shares.items()}
+    # largest remainders fill the tile
+    for name in sorted(shares, key=lambda name: crops[name] - shares[name])[:area - sum(crops.values())]:
+        crops[name] += 1
+    return {name: cnt for name, cnt in crops.items() if cnt > 0}
+
+def main():
+    """Command line entry point: build patterns offline and add them to the library"""
+    parser = argparse.ArgumentParser(description='Build high-scoring tile patterns for the warm start library')
+    parser.add_argument('--config', nargs='+', help='Build tiles from these plot configs (1x1 crops, scaled to --shape) '
+                                                    'instead of the default crop pairs and triples')
+    parser.add_argument('--shape', default='4x4', help='Tile shape for --config, e.g. 4x4 (default: 4x4)')
+    parser.add_argument('--modes', nargs='+', choices=list(MODE_WEIGHTS), default=list(MODE_WEIGHTS),
+                        help='Optimization modes to build (default: all)')
+    parser.add_argument('--iterations', type=int, default=BUILD_ITERATIONS,
+                        help=f'Search moves per restart (default: {BUILD_ITERATIONS})')
+    parser.add_argument('--restarts', type=int, default=BUILD_RESTARTS, help=f'Restarts per tile (default: {BUILD_RESTARTS})')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--library', default=PATTERNS_FILE, help='Pattern library file (default: the bundled patterns.json)')
+    args = parser.parse_args()
+
+    if args.config:
+        rows, cols = (int(part) for part in args.shape.lower().split("x"))
+        tiles = [(rows, cols, config_tile(path, rows, cols)) for path in args.config]
+    else:
+        tiles = list(default_tiles())
+    library = PatternLibrary(args.library)
+    stored = 0
+    for rows, cols, crops in tiles:
+        for mode in args.modes:
+            try:
+                layout, score = build_pattern(rows, cols, crops, mode, iterations=args.iterations,
+                                              restarts=args.restarts, seed=args.seed)
+            except ValueError as e:
+                print(f"Skipped: {e}", file=sys.stderr)
+                continue
+            if library.put(layout, crops, mode, score):
+                stored += 1
+                print(f"{pattern_key(rows, cols, crops, mode)}: {score:.3f}")
+    library.save()
+    print(f"Stored {stored} patterns, {len(library)} in {args.library}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
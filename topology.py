@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Precomputed grid geometry (neighbors and footprint perimeters) for Palia Garden Optimizer
+"""
+
+from crops import CROPS
+
+# Cell maps (r, c, rows, cols) -> (r, c) of the reflections and rotations of a grid.
+# The last four swap rows and columns, so they only apply to square grids.
+SYMMETRIES = {
+    "identity": lambda r, c, rows, cols: (r, c),
+    "flip_rows": lambda r, c, rows, cols: (rows - 1 - r, c),
+    "flip_cols": lambda r, c, rows, cols: (r, cols - 1 - c),
+    "rotate_180": lambda r, c, rows, cols: (rows - 1 - r, cols - 1 - c),
+    "transpose": lambda r, c, rows, cols: (c, r),
+    "anti_transpose": lambda r, c, rows, cols: (cols - 1 - c, rows - 1 - r),
+    "rotate_90": lambda r, c, rows, cols: (c, rows - 1 - r),
+    "rotate_270": lambda r, c, rows, cols: (cols - 1 - c, r),
+}
+TRANSPOSING = ("transpose", "anti_transpose", "rotate_90", "rotate_270")
+
+class GridTopology:
+    """Neighbor and footprint tables for one (rows, cols) grid shape"""
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        # (nr, nc) neighbors per cell, indexed [r][c]
+        self.cell_neighbors = [
+            [self._ortho(r, c) for c in range(cols)]
+            for r in range(rows)
+        ]
+        # flat neighbor indices per flat cell index (r * cols + c)
+        self.neighbors = [
+            tuple(nr * cols + nc for nr, nc in cell)
+            for row in self.cell_neighbors for cell in row
+        ]
+        self._perimeters = {}
+        self._regions = {}
+        self._anchor_maps = {}
+        # Symmetries of the grid that map every crop footprint onto one of the same size
+        square_crops = all(w == h for w, h in (meta["size"] for meta in CROPS.values()))
+        self.symmetries = tuple(
+            name for name in SYMMETRIES
+            if name not in TRANSPOSING or (rows == cols and square_crops)
+        )
+        for w, h in sorted({meta["size"] for meta in CROPS.values()}):
+            self.perimeter(w, h)
+            self.region(w, h)
+
+    def _ortho(self, r, c):
+        """Orthogonal neighbors of a cell"""
+        cells = []
+        for dr, dc in ((-1,0),(1,0),(0,-1),(0,1)):
+            nr, nc = r+dr, c+dc
+            if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                cells.append((nr, nc))
+        return tuple(cells)
+
+    def _perimeter_cells(self, top_r, top_c, w, h):
+        """Cells outside a footprint that touch one of its edges"""
+        cells = []
+        if top_r > 0:
+            cells.extend((top_r - 1, c) for c in range(top_c, top_c + w))
+        if top_r + h < self.rows:
+            cells.extend((top_r + h, c) for c in range(top_c, top_c + w))
+        if top_c > 0:
+            cells.extend((r, top_c - 1) for r in range(top_r, top_r + h))
+        if top_c + w < self.cols:
+            cells.extend((r, top_c + w) for r in range(top_r, top_r + h))
+        return tuple(cells)
+
+    def perimeter(self, w, h):
+        """Boundary neighbor cells of a (w, h) footprint, indexed [top_r][top_c]"""
+        table = self._perimeters.get((w, h))
+        if table is None:
+            table = [
+                [self._perimeter_cells(r, c, w, h) for c in range(self.cols - w + 1)]
+                for r in range(self.rows - h + 1)
+            ]
+            self._perimeters[(w, h)] = table
+        return table
+
+    def region(self, w, h):
+        """Footprint plus boundary neighbor cells, indexed [top_r][top_c].
+
+        These are exactly the cells whose score can change when a plant of
+        this size appears at or disappears from the anchor.
+        """
+        table = self._regions.get((w, h))
+        if table is None:
+            perimeter = self.perimeter(w, h)
+            table = [
+                [
+                    tuple((r, c) for r in range(top_r, top_r + h) for c in range(top_c, top_c + w))
+                    + perimeter[top_r][top_c]
+                    for top_c in range(self.cols - w + 1)
+                ]
+                for top_r in range(self.rows - h + 1)
+            ]
+            self._regions[(w, h)] = table
+        return table
+
+    def anchor_map(self, symmetry, w, h):
+        """Anchor of a (w, h) footprint after a symmetry, indexed [top_r][top_c].
+
+        The footprint's corners are mapped and the new top-left corner taken,
+        so a plant keeps its size (transposing maps swap w and h).
+        """
+        table = self._anchor_maps.get((symmetry, w, h))
+        if table is None:
+            cell = SYMMETRIES[symmetry]
+            rows, cols = self.rows, self.cols
+            table = []
+            for top_r in range(rows - h + 1):
+                row = []
+                for top_c in range(cols - w + 1):
+                    r0, c0 = cell(top_r, top_c, rows, cols)
+                    r1, c1 = cell(top_r + h - 1, top_c + w - 1, rows, cols)
+                    row.append((min(r0, r1), min(c0, c1)))
+                table.append(row)
+            self._anchor_maps[(symmetry, w, h)] = table
+        return table
+
+# Only the most recently used grid shape is kept
+_cached_topology = None
+
+def get_topology(rows, cols):
+    """Get the topology for a grid shape, rebuilding it when the shape changes"""
+    global _cached_topology
+    topo = _cached_topology
+    if topo is None or topo.rows != rows or topo.cols != cols:
+        topo = GridTopology(rows, cols)
+        _cached_topology = topo
+    return topo
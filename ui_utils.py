@@ -8,7 +8,7 @@ import tkinter as tk
 import os
 import sys
 from PIL import Image, ImageTk
-from crops import CROPS
+from config import get_config_dir
 
 def get_resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -61,29 +61,129 @@ def create_tooltip(widget, text):
     widget.bind('<Enter>', enter)
     widget.bind('<Leave>', leave)
 
-def load_crop_images(pics_folder="pics", thumbnail_size=(24, 24)):
-    """Load crop images and create thumbnails"""
-    images = {}
-    # Use resource path for bundled executable
-    pics_path = get_resource_path(pics_folder)
-    if not os.path.exists(pics_path):
-        print(f"Warning: Images folder not found at {pics_path}")
-        return images
-    
-    for crop_name in CROPS.keys():
-        # Try different extensions
-        for ext in ['.webp', '.png', '.jpg', '.jpeg']:
-            image_path = os.path.join(pics_path, f"{crop_name}{ext}")
-            if os.path.exists(image_path):
-                try:
-                    # Load and resize image
-                    pil_image = Image.open(image_path)
-                    pil_image = pil_image.resize(thumbnail_size, Image.Resampling.LANCZOS)
-                    tk_image = ImageTk.PhotoImage(pil_image)
-                    images[crop_name] = tk_image
+class CropImageCache:
+    """Crop thumbnails in a few resolution buckets, decoded on first use.
+
+    Resized thumbnails are kept as PNG files in the config directory, keyed
+    by the source image's mtime and size, so later starts skip the webp
+    decode and LANCZOS resize. get() picks the largest bucket that fits.
+    """
+    BUCKETS = (24, 32, 48, 64, 96)
+    EXTENSIONS = ('.webp', '.png', '.jpg', '.jpeg')
+
+    def __init__(self, pics_folder="pics", cache_dir=None):
+        self.pics_path = get_resource_path(pics_folder)
+        self.cache_dir = cache_dir or os.path.join(get_config_dir(), "thumbnails")
+        self._sources = {}  # crop name -> source path or None
+        self._images = {}   # (crop name, bucket) -> PhotoImage or None
+
+    def bucket_for(self, size):
+        """Largest bucket not above size (the smallest bucket for tiny sizes)"""
+        fitting = [b for b in self.BUCKETS if b <= size]
+        return fitting[-1] if fitting else self.BUCKETS[0]
+
+    def source(self, crop_name):
+        """Path of the crop's source image, or None"""
+        if crop_name not in self._sources:
+            path = None
+            for ext in self.EXTENSIONS:
+                candidate = os.path.join(self.pics_path, f"{crop_name}{ext}")
+                if os.path.exists(candidate):
+                    path = candidate
                     break
-                except Exception as e:
-                    print(f"Hiba a kép betöltésekor {image_path}: {e}")
-                    continue
-    
-    return images
+            self._sources[crop_name] = path
+        return self._sources[crop_name]
+
+    def __contains__(self, crop_name):
+        return self.source(crop_name) is not None
+
+    def get(self, crop_name, size=24):
+        """PhotoImage of the crop for a display size in pixels, or None if there is no image"""
+        bucket = self.bucket_for(size)
+        key = (crop_name, bucket)
+        if key not in self._images:
+            self._images[key] = self._load(crop_name, bucket)
+        return self._images[key]
+
+    def _load(self, crop_name, bucket):
+        """Read a thumbnail from the disk cache, or create and store it"""
+        path = self.source(crop_name)
+        if path is None:
+            return None
+        try:
+            st = os.stat(path)
+            cache_file = os.path.join(self.cache_dir, f"{crop_name}_{bucket}_{st.st_mtime_ns}_{st.st_size}.png")
+            if os.path.exists(cache_file):
+                return ImageTk.PhotoImage(Image.open(cache_file))
+            pil_image = Image.open(path).resize((bucket, bucket), Image.Resampling.LANCZOS)
+            self._store(pil_image, cache_file, f"{crop_name}_{bucket}_")
+            return ImageTk.PhotoImage(pil_image)
+        except Exception as e:
+            print(f"Error loading image {path}: {e}")
+            return None
+
+    def _store(self, pil_image, cache_file, prefix):
+        """Save a thumbnail and drop stale versions of it; the cache is optional, so errors are ignored"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for old in os.listdir(self.cache_dir):
+                if old.startswith(prefix) and old.count("_") == prefix.count("_") + 1:
+                    os.remove(os.path.join(self.cache_dir, old))
+            pil_image.save(cache_file, "PNG")
+        except OSError as e:
+            print(f"Could not write thumbnail cache: {e}")
+
+class GridGeometry:
+    """Cell size, offsets and cell rectangles of the garden canvas.
+
+    Computed once per canvas size and grid shape, so drawing, clicks and
+    hovering share one layout and pixel <-> cell lookups need no Tk calls.
+    """
+    PAD = 10
+
+    def __init__(self, width, height, rows, cols):
+        self.width = width
+        self.height = height
+        self.rows = rows
+        self.cols = cols
+        
+        # Square cells, larger for small grids
+        max_cell_by_width = (width - 2*self.PAD) // max(1, cols)
+        max_cell_by_height = (height - 2*self.PAD) // max(1, rows)
+        cell_size = max(min(max_cell_by_width, max_cell_by_height, 120), 30)
+        total_cells = rows * cols
+        if total_cells <= 25:  # 5x5 or smaller
+            cell_size = min(max_cell_by_width, max_cell_by_height, 150)
+        elif total_cells <= 64:  # 8x8 or smaller
+            cell_size = min(max_cell_by_width, max_cell_by_height, 100)
+        self.cell_size = cell_size
+        
+        # Center the grid
+        self.start_x = (width - cell_size * cols) // 2
+        self.start_y = (height - cell_size * rows) // 2
+        # (x0, y0, x1, y1) per cell, indexed [r][c]
+        self.cell_rects = [
+            [(self.start_x + c * cell_size, self.start_y + r * cell_size,
+              self.start_x + c * cell_size + cell_size - 1, self.start_y + r * cell_size + cell_size - 1)
+             for c in range(cols)]
+            for r in range(rows)
+        ]
+
+    def matches(self, width, height, rows, cols):
+        """True if this geometry is still valid for the canvas size and grid shape"""
+        return (self.width, self.height, self.rows, self.cols) == (width, height, rows, cols)
+
+    def cell_at(self, x, y):
+        """Grid cell (r, c) under a pixel, or None outside the grid"""
+        if self.cell_size <= 0 or x < self.start_x or y < self.start_y:
+            return None
+        c = (x - self.start_x) // self.cell_size
+        r = (y - self.start_y) // self.cell_size
+        if r >= self.rows or c >= self.cols:
+            return None
+        return int(r), int(c)
+
+    def plant_rect(self, top_r, top_c, w, h):
+        """Rectangle of a w x h plant anchored at (top_r, top_c)"""
+        x0, y0 = self.start_x + top_c * self.cell_size, self.start_y + top_r * self.cell_size
+        return x0, y0, x0 + w * self.cell_size - 2, y0 + h * self.cell_size - 2
@@ -61,6 +61,39 @@ def validate_single_file(file_path):
         print(f"❌ Error: Failed to validate {file_path}: {e}")
         return False
 
+def validate_index(index_path, json_files):
+    """Check that lang/index.json lists every language file with its language_name"""
+    print(f"🔎 Validating {index_path}...")
+    try:
+        with open(index_path, 'r', encoding='utf-8-sig') as f:
+            index = json.load(f)
+    except Exception as e:
+        print(f"❌ Error: Could not read {index_path}: {e}")
+        return False
+    
+    valid = True
+    for file_path in json_files:
+        code = os.path.splitext(os.path.basename(file_path))[0]
+        try:
+            with open(file_path, 'r', encoding='utf-8-sig') as f:
+                name = json.load(f).get('language_name')
+        except Exception:
+            continue  # already reported by validate_single_file
+        if code not in index:
+            print(f"❌ Error: {code} is missing from {index_path}")
+            valid = False
+        elif index[code] != name:
+            print(f"❌ Error: {index_path} names {code} '{index[code]}' but the file says '{name}'")
+            valid = False
+    for code in index:
+        if not os.path.exists(os.path.join(os.path.dirname(index_path), f"{code}.json")):
+            print(f"❌ Error: {index_path} lists {code} but {code}.json does not exist")
+            valid = False
+    
+    if valid:
+        print(f"✅ {index_path} is valid ({len(index)} languages)")
+    return valid
+
 def validate_json_files():
     """Validate all JSON files in the lang directory"""
     print("🔍 Validating JSON files...")
@@ -70,8 +103,9 @@ def validate_json_files():
         print(f"❌ Error: {lang_dir} directory not found!")
         return False
     
-    # Find all JSON files
-    json_files = glob.glob(os.path.join(lang_dir, "*.json"))
+    # Find all JSON files (the language index is checked separately)
+    index_path = os.path.join(lang_dir, "index.json")
+    json_files = [f for f in glob.glob(os.path.join(lang_dir, "*.json")) if os.path.abspath(f) != os.path.abspath(index_path)]
     
     if not json_files:
         print(f"❌ Error: No JSON files found in {lang_dir} directory!")
@@ -88,6 +122,9 @@ def validate_json_files():
         if not validate_single_file(file_path):
             all_valid = False
     
+    if not validate_index(index_path, json_files):
+        all_valid = False
+    
     print()
     if all_valid:
         print("✅ All JSON files are valid!")